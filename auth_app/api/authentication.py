@@ -0,0 +1,103 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from core.db_router import reading_from_replica, use_primary
+
+
+class TokenCache:
+    """
+    Maps token keys to a snapshot of the token's user.
+    - Backed by a Django cache alias, which provides the TTL and the size bound
+    - Keys are hashed, the raw token is never used as cache key
+    - The password hash is not part of the snapshot
+    - Counts hits and misses of this process
+    """
+
+    def __init__(self, alias, timeout):
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._fields = [field for field in User._meta.concrete_fields if field.attname != "password"]
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, token_key):
+        return "auth-token:" + hashlib.sha256(token_key.encode()).hexdigest()
+
+    def get_user(self, token_key):
+        """
+        Return the cached user for the token, or None.
+        - The user is rebuilt without a query; the password field is deferred
+        """
+        values = self.cache.get(self.key(token_key))
+        with self._lock:
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if values is None:
+            return None
+        return User.from_db("default", [field.attname for field in self._fields], values)
+
+    def set_user(self, token_key, user):
+        values = [getattr(user, field.attname) for field in self._fields]
+        self.cache.set(self.key(token_key), values, self.timeout)
+
+    def evict(self, *token_keys):
+        if token_keys:
+            self.cache.delete_many([self.key(token_key) for token_key in token_keys])
+
+    def evict_user(self, user_id):
+        self.evict(*Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+            }
+
+
+_config = getattr(settings, "AUTH_TOKEN_CACHE", {})
+token_cache = TokenCache(
+    alias=_config.get("ALIAS", "default"),
+    timeout=_config.get("TIMEOUT", 10),
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that skips the Token + User query for known tokens.
+    - Only active users are cached; logout, deactivation and password
+      changes evict the entries (see auth_app.signals). Other processes only
+      see the eviction with a shared cache backend, otherwise after TIMEOUT
+      (AUTH_TOKEN_CACHE)
+    - A token unknown to the read replica is looked up on the primary: it
+      may have been created a moment ago (login, registration)
+    """
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get_user(key)
+        if user is not None:
+            return (user, Token(key=key, user=user))
+        try:
+            user, token = super().authenticate_credentials(key)
+        except exceptions.AuthenticationFailed:
+            if not reading_from_replica():
+                raise
+            with use_primary():
+                user, token = super().authenticate_credentials(key)
+        token_cache.set_user(key, user)
+        return (user, token)
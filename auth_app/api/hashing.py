@@ -0,0 +1,30 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.AUTH_PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _executor
+
+
+def hash_password_async(raw_password):
+    """
+    Start hashing a password and return a Future with the encoded hash.
+    - Runs on a bounded thread pool (AUTH_PASSWORD_HASH_WORKERS threads);
+      hashlib releases the GIL, so the caller can do its queries meanwhile
+    - With 0 workers the hash is computed inline
+    """
+    if getattr(settings, "AUTH_PASSWORD_HASH_WORKERS", 0) <= 0:
+        future = Future()
+        future.set_result(make_password(raw_password))
+        return future
+    return _get_executor().submit(make_password, raw_password)
@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from kanban_app.membership import is_board_member
 
 class IsOwnerOrMemberBoard(BasePermission):
     """
@@ -13,8 +14,7 @@ class IsOwnerOrMemberBoard(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Object-level check AFTER board is loaded (404 already handled)
-        user = request.user
-        return obj.owner == user or user in obj.members.all()
+        return is_board_member(request.user, obj, request)
 
 class IsBoardMemberForTask(BasePermission):
     #Only Board owner or Board members can access the Task
@@ -23,10 +23,9 @@ class IsBoardMemberForTask(BasePermission):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        if not obj.board:
+        if not obj.board_id:
             return False  
-        user = request.user
-        return obj.board.owner == user or user in obj.board.members.all() 
+        return is_board_member(request.user, obj.board_id, request)
 
 class IsCommentAuthorOrBoardMember(BasePermission):
     """
@@ -41,10 +40,9 @@ class IsCommentAuthorOrBoardMember(BasePermission):
         
         # GET/POST → board members or owner
         if request.method in SAFE_METHODS:
-            if not obj.task or not obj.task.board:
+            if not obj.task or not obj.task.board_id:
                 return False  # Task or Board missing → deny
-            board = obj.task.board
-            return user == board.owner or user in board.members.all()
+            return is_board_member(user, obj.task.board_id, request)
 
         # Edit/Delete → only comment author
         return user == obj.author
\ No newline at end of file
@@ -1,7 +1,11 @@
 from django.contrib.auth.models import User
-from django.db import transaction
-from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from auth_app.backends import EmailBackend
+from .hashing import hash_password_async
+
+# Attempts to save a new user when concurrent signups take the same username
+USERNAME_ATTEMPTS = 5
 
 def validate_registration_data(data):
     """
@@ -34,12 +38,16 @@ def generate_username(first_name, last_name):
     """
     Generate a unique username based on first and last name.
     - Format: first.last
-    - If username exists, append a number until unique.
+    - If username exists, append the lowest free number
+    - All taken candidates are loaded with a single prefix query
     """
     base_username = f"{first_name.lower()}.{last_name.lower()}"
+    taken = set(
+        User.objects.filter(username__startswith=base_username).values_list("username", flat=True)
+    )
     username = base_username
     counter = 1
-    while User.objects.filter(username=username).exists():
+    while username in taken:
         username = f"{base_username}{counter}"
         counter += 1
     return username
@@ -49,23 +57,29 @@ def create_user(validated_data):
     """
     Create a new User instance in the database.
     - Extracts 'fullname' and splits into first/last names
-    - Generates a unique username
-    - Saves user with hashed password using transaction.atomic()
+    - Hashes the password on the hashing pool while the username is chosen
+    - Generates a unique username and retries if a concurrent signup
+      saved the same one first (unique constraint)
     """
     fullname = validated_data.pop('fullname')
     validated_data.pop('repeated_password')
     first_name, last_name = split_full_name(fullname)
-    username = generate_username(first_name, last_name)
-    with transaction.atomic():
-        user = User(
-            email=validated_data['email'],
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-        )
-        user.set_password(validated_data['password'])
-        user.save()
-    return user
+    password_hash = hash_password_async(validated_data['password'])
+    user = User(
+        email=validated_data['email'],
+        first_name=first_name,
+        last_name=last_name,
+    )
+    for attempt in range(USERNAME_ATTEMPTS):
+        user.username = generate_username(first_name, last_name)
+        user.password = password_hash.result()
+        try:
+            with transaction.atomic():
+                user.save()
+            return user
+        except IntegrityError:
+            if attempt == USERNAME_ATTEMPTS - 1:
+                raise
 
 class RegisterationSerializer(serializers.ModelSerializer):
     """
@@ -104,15 +118,16 @@ class UserLoginSerializer(serializers.Serializer):
         - Raise ValidationError if email does not exist
         - Raise ValidationError if password is incorrect
         - Add the authenticated user object to data['user']
+        The user (with its token) is loaded once and the password is checked
+        against that instance.
         """
         email = data.get('email')
         password = data.get('password')
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
+        backend = EmailBackend()
+        user = backend.get_user_by_email(email)
+        if user is None:
             raise serializers.ValidationError("Ungültige E-mail")
-        user = authenticate(username=user.username, password=password)
-        if not user:
+        if not backend.verify(user, password):
             raise serializers.ValidationError("Passwort ist falsch")
         data['user'] = user
         return data
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import RegisterView, UserLoginView, LogoutView
+from .views import RegisterView, UserLoginView, LogoutView, TokenCacheStatsView
 
 # ------------------------------
 # Authentication Endpoints
@@ -9,4 +9,5 @@ urlpatterns = [
     path('registration/', RegisterView.as_view(), name='register'),
     path('login/', UserLoginView.as_view(), name='login'),
     path('logout/', LogoutView.as_view(), name='logout'),
+    path('token-cache-stats/', TokenCacheStatsView.as_view(), name='token-cache-stats'),
 ]
\ No newline at end of file
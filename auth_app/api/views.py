@@ -1,12 +1,30 @@
-from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.authtoken.models import Token
 from rest_framework.generics import GenericAPIView
+from .authentication import token_cache
 from .serializers import RegisterationSerializer, UserLoginSerializer
 
+def token_for(user):
+    """
+    Return the user's token, creating it if needed.
+    - Uses the token joined by EmailBackend, so existing tokens cost no query
+    """
+    try:
+        return user.auth_token
+    except Token.DoesNotExist:
+        pass
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user)
+    except IntegrityError:
+        # A concurrent login created it first
+        return Token.objects.get(user=user)
+
+
 class RegisterView(APIView):
     """
     API endpoint for user registration.
@@ -45,7 +63,7 @@ class UserLoginView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
         data = {}
         user = serializer.validated_data['user']
-        token, created = Token.objects.get_or_create(user=user)
+        token = token_for(user)
         data = {
             'token' : token.key,
             'fullname': f"{user.first_name} {user.last_name}".strip(),
@@ -59,9 +77,22 @@ class LogoutView(APIView):
     """
     API endpoint for logging out an authenticated user.
     - Requires authentication
-    - Deletes the user's token
+    - Deletes the user's token and evicts it from the token cache
     """
 
     def post(self, request):
+        key = request.user.auth_token.key
         request.user.auth_token.delete()
-        return Response({"detail": "Logout erfolgreich. Token wurde gelöscht."}, status=status.HTTP_200_OK)
\ No newline at end of file
+        token_cache.evict(key)
+        return Response({"detail": "Logout erfolgreich. Token wurde gelöscht."}, status=status.HTTP_200_OK)
+
+
+class TokenCacheStatsView(APIView):
+    """
+    API endpoint exposing the token cache counters of this process.
+    - Admin users only
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(token_cache.stats())
\ No newline at end of file
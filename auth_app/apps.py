@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AuthAppConfig(AppConfig):
     name = 'auth_app'
+
+    def ready(self):
+        # Register signal handlers (token cache eviction)
+        from . import signals  # noqa: F401
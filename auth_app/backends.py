@@ -0,0 +1,78 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.functions import Lower
+
+
+def unknown_email_config():
+    config = {
+        "ALIAS": "default",
+        "TIMEOUT": 0,
+    }
+    config.update(getattr(settings, "AUTH_UNKNOWN_EMAIL_CACHE", {}))
+    return config
+
+
+def unknown_email_key(email):
+    return "unknown-email:" + hashlib.sha256(email.lower().encode()).hexdigest()
+
+
+def forget_unknown_email(email):
+    """
+    Remove an email from the negative cache (called when a user gets it).
+    - Again after the commit: a login running meanwhile does not see the
+      user yet and may have cached the email as unknown
+    """
+    config = unknown_email_config()
+    if not email or config["TIMEOUT"] <= 0:
+        return
+    cache = caches[config["ALIAS"]]
+    cache.delete(unknown_email_key(email))
+    transaction.on_commit(lambda: cache.delete(unknown_email_key(email)))
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with email and password in a single query.
+    - Emails are compared case-insensitively on the indexed LOWER(email),
+      the oldest user wins (as in kanban_app.user_lookup)
+    - The user's token is joined in the same query (user.auth_token)
+    - Unknown emails can be remembered for a few seconds
+      (AUTH_UNKNOWN_EMAIL_CACHE, off by default), so repeated attempts skip
+      the users table
+    """
+
+    def get_user_by_email(self, email):
+        config = unknown_email_config()
+        timeout = config["TIMEOUT"]
+        cache = caches[config["ALIAS"]]
+        if timeout > 0 and cache.get(unknown_email_key(email)):
+            return None
+        user = (
+            User.objects.select_related("auth_token")
+            .annotate(email_lower=Lower("email"))
+            .filter(email_lower=email.lower())
+            .order_by("pk")
+            .first()
+        )
+        if user is None and timeout > 0:
+            cache.set(unknown_email_key(email), True, timeout)
+        return user
+
+    def verify(self, user, password):
+        """
+        Check the password against the already loaded user.
+        """
+        return user.check_password(password) and self.user_can_authenticate(user)
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        user = self.get_user_by_email(email)
+        if user is not None and self.verify(user, password):
+            return user
+        return None
@@ -0,0 +1,72 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+class Command(BaseCommand):
+    """
+    Simulate a login storm against POST /api/login/.
+    - Creates temporary users sharing one password hash
+    - Mixes in logins with unknown emails (credential stuffing)
+    - Reports logins/s and queries per login, then deletes the users
+    """
+    help = "Benchmark the login endpoint under many concurrent logins."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--logins", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--unknown-ratio", type=float, default=0.2, help="Share of logins with unknown emails.")
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        password = "bench-password"
+        password_hash = make_password(password)
+        User.objects.bulk_create(
+            User(username=f"bench.login.{run_id}.{number}", email=f"login-{run_id}-{number}@example.com", password=password_hash)
+            for number in range(options["users"])
+        )
+        unknown_every = round(1 / options["unknown_ratio"]) if options["unknown_ratio"] > 0 else 0
+
+        def email_for(number):
+            if unknown_every and number % unknown_every == 0:
+                return f"unknown-{run_id}-{number % 10}@example.com"
+            return f"login-{run_id}-{number % options['users']}@example.com"
+
+        def login(number):
+            response = APIClient(SERVER_NAME="localhost").post(
+                "/api/login/", {"email": email_for(number), "password": password}, format="json"
+            )
+            return response.status_code
+
+        try:
+            sample = min(100, options["logins"])
+            with CaptureQueriesContext(connection) as queries:
+                for number in range(sample):
+                    login(number)
+            self.stdout.write(f"queries per login: {len(queries) / sample:.2f} (first {sample}, includes token creation)")
+
+            def worker(number):
+                try:
+                    return login(number)
+                finally:
+                    connections.close_all()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                codes = list(pool.map(worker, range(options["logins"])))
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{options['logins']} logins with {options['concurrency']} clients: "
+                f"{options['logins'] / elapsed:.1f} logins/s, "
+                f"{codes.count(200)} ok, {codes.count(400)} rejected"
+            )
+        finally:
+            User.objects.filter(username__startswith=f"bench.login.{run_id}.").delete()
@@ -0,0 +1,67 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+class Command(BaseCommand):
+    """
+    Measure registration throughput for colliding names.
+    - Every signup uses the same full name, so each one needs a new suffix
+    - Runs sequentially (with query count) and with concurrent clients
+    - The created users are deleted afterwards
+    """
+    help = "Benchmark POST /api/registration/ with colliding names."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--signups", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        fullname = f"Bench {run_id}"
+        signups = options["signups"]
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                elapsed = self.register(fullname, run_id, range(signups), concurrency=1)
+            self.report("sequential", signups, elapsed, len(queries) / signups)
+
+            elapsed = self.register(fullname, run_id, range(signups, 2 * signups), options["concurrency"])
+            self.report(f"{options['concurrency']} clients", signups, elapsed)
+        finally:
+            User.objects.filter(username__startswith=f"bench.{run_id}").delete()
+
+    def register(self, fullname, run_id, numbers, concurrency):
+        def signup(number):
+            try:
+                response = APIClient(SERVER_NAME="localhost").post("/api/registration/", {
+                    "fullname": fullname,
+                    "email": f"bench-{run_id}-{number}@example.com",
+                    "password": "bench-password",
+                    "repeated_password": "bench-password",
+                }, format="json")
+                if response.status_code != 201:
+                    self.stderr.write(f"Signup {number} failed: {response.status_code}")
+            finally:
+                if concurrency > 1:
+                    connections.close_all()
+
+        start = time.perf_counter()
+        if concurrency == 1:
+            for number in numbers:
+                signup(number)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(signup, numbers))
+        return time.perf_counter() - start
+
+    def report(self, label, signups, elapsed, queries=None):
+        line = f"{label:>12}: {signups / elapsed:8.1f} signups/s"
+        if queries is not None:
+            line += f", {queries:.1f} queries per signup"
+        self.stdout.write(line)
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index auth_user.email.
+    - Used by the email check endpoint, login and the registration uniqueness check
+    - auth.User belongs to django.contrib.auth, so the index is created with SQL here
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_idx ON auth_user (email);',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_idx;',
+        ),
+    ]
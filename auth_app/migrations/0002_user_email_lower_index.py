@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index LOWER(auth_user.email).
+    - Case-insensitive email lookups and prefix ranges of the member picker
+      (kanban_app.user_lookup)
+    - Expression index, supported by SQLite and PostgreSQL
+    """
+
+    dependencies = [
+        ('auth_app', '0001_user_email_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_lower_idx ON auth_user (LOWER(email));',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_lower_idx;',
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from auth_app.api.authentication import token_cache
+from auth_app.backends import forget_unknown_email
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    # Covers deactivation, password and profile changes
+    if not created:
+        token_cache.evict_user(instance.pk)
+    forget_unknown_email(instance.email)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    token_cache.evict(instance.key)
@@ -0,0 +1,205 @@
+"""
+Read replica routing with read-your-writes stickiness.
+
+ReplicaRoutingMiddleware marks a request as a replica read when:
+- it uses a safe method (GET, HEAD, OPTIONS) on one of the PATH_PREFIXES
+- its client has not written within the last STICKY_SECONDS
+
+ReplicaRouter then sends the reads of that request to one of the
+DATABASE_ROUTING["REPLICAS"] aliases (one per request). Everything else uses
+the primary ("default"): writes, unsafe requests, management commands and
+work outside requests. A request that sends a statement other than SELECT
+to the primary switches to the primary for the rest of the request.
+
+After a successful unsafe request the client (its Authorization header, or
+its session cookie) is remembered in the CACHE_ALIAS cache for
+STICKY_SECONDS, so its next reads see its own changes. Use a shared cache
+backend when running several processes.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_current = ContextVar("db_routing", default=None)
+
+
+def routing_config():
+    config = {
+        "REPLICAS": [],
+        "STICKY_SECONDS": 5,
+        "PATH_PREFIXES": ["/api/"],
+        "CACHE_ALIAS": "default",
+    }
+    config.update(getattr(settings, "DATABASE_ROUTING", {}))
+    return config
+
+
+class RoutingState:
+    """
+    Database choice of one request, shared with the threads it uses.
+    - replica: alias serving the reads, None for primary-only requests
+    - wrote: set by the first write statement, the request stays on the primary
+    - pinned: depth of use_primary() blocks
+    """
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+        self.pinned = 0
+
+    @property
+    def read_alias(self):
+        if self.wrote or self.pinned:
+            return None
+        return self.replica
+
+
+def reading_from_replica():
+    """
+    True if reads of the current request currently go to a replica.
+    """
+    state = _current.get()
+    return state is not None and state.read_alias is not None
+
+
+@contextmanager
+def use_primary():
+    """
+    Read from the primary inside the block.
+    - For reads that must see the latest commits (event feed, a token
+      created a moment ago); no-op outside replica reads
+    """
+    state = _current.get()
+    if state is None:
+        yield
+        return
+    state.pinned += 1
+    try:
+        yield
+    finally:
+        state.pinned -= 1
+
+
+class ReplicaRouter:
+    """
+    Reads of replica-read requests go to their replica, the rest to the primary.
+    - Replicas are copies of the primary: never migrated, relations between
+      objects of the primary and the replicas are allowed
+    """
+
+    def __init__(self):
+        self.replicas = set(routing_config()["REPLICAS"])
+
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        if state is None:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Also asked when related objects are assigned, so writes are
+        # detected on the primary's statements instead (detect_writes)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *self.replicas}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in self.replicas:
+            return False
+        return None
+
+
+def detect_writes(execute, sql, params, many, context):
+    state = _current.get()
+    if state is not None and not state.wrote and sql.lstrip()[:6].upper() != "SELECT":
+        state.wrote = True
+    return execute(sql, params, many, context)
+
+
+def install_write_detector(sender, connection, **kwargs):
+    if connection.alias == DEFAULT_DB_ALIAS and detect_writes not in connection.execute_wrappers:
+        connection.execute_wrappers.append(detect_writes)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choose the database of each request, see the module docstring.
+    - Place it before the middleware and views that query the database
+    - Not loaded at all (MiddlewareNotUsed) when no replica is configured
+    - Works for sync and async views (the state travels in a context variable)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = routing_config()
+        if not config["REPLICAS"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.replicas = list(config["REPLICAS"])
+        self.sticky_seconds = config["STICKY_SECONDS"]
+        self.path_prefixes = tuple(config["PATH_PREFIXES"])
+        self.cache_alias = config["CACHE_ALIAS"]
+        connection_created.connect(install_write_detector, dispatch_uid="replica_write_detector")
+        for connection in connections.all(initialized_only=True):
+            install_write_detector(None, connection)
+
+    def client_key(self, request):
+        """
+        Cache key of the client, None for anonymous clients.
+        - The credential is hashed, it is never used as cache key
+        """
+        credential = request.headers.get("Authorization") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if not credential:
+            return None
+        return "db-sticky:" + hashlib.sha256(credential.encode()).hexdigest()
+
+    def start(self, request, key):
+        if request.method not in SAFE_METHODS or not request.path.startswith(self.path_prefixes):
+            return RoutingState(None)
+        if key is not None and caches[self.cache_alias].get(key):
+            return RoutingState(None)
+        return RoutingState(random.choice(self.replicas))
+
+    def finish(self, request, response, key):
+        # Validation errors and denied requests did not write anything
+        if key is not None and request.method not in SAFE_METHODS and response.status_code < 400:
+            caches[self.cache_alias].set(key, True, self.sticky_seconds)
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        key = self.client_key(request)
+        token = _current.set(self.start(request, key))
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, key)
+
+    async def __acall__(self, request):
+        key = self.client_key(request)
+        token = _current.set(self.start(request, key))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, key)
@@ -0,0 +1,326 @@
+"""
+Per-request performance instrumentation.
+
+ServerTimingMiddleware samples requests (REQUEST_METRICS["SAMPLE_RATE"], or
+forced with the FORCE_HEADER request header). For a sampled request it
+records:
+- db: number and time of the SQL queries (execute wrapper on every connection)
+- auth / perm: DRF authentication and (object) permission checks
+- serialize: serializer .data
+- render: response rendering
+- total: time spent below the middleware
+
+The phases are emitted as a Server-Timing header and the randomly sampled
+requests are aggregated per route in request_metrics (GET /api/metrics/).
+Phases overlap: queries run during serialization count for both.
+The Server-Timing header is only sent in DEBUG, to staff users or to
+everyone with REQUEST_METRICS["PUBLIC"]; others forcing a measurement get
+nothing back (query counts and durations of /api/login/ would leak).
+Requests that are not sampled only pay for a random() call and a header
+lookup; the DRF hooks and the execute wrapper check a context variable and
+step aside.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current = ContextVar("request_timings", default=None)
+
+
+def metrics_config():
+    config = {
+        "SAMPLE_RATE": 0.05,
+        "FORCE_HEADER": "X-Request-Timing",
+        "SERVER_TIMING_HEADER": True,
+        "PUBLIC": False,
+        "BUCKETS_MS": [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000],
+    }
+    config.update(getattr(settings, "REQUEST_METRICS", {}))
+    return config
+
+
+class RequestTimings:
+    """
+    Timings of one sampled request, shared with the threads it uses.
+    """
+    PHASES = ("auth", "perm", "serialize", "render")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.db = 0.0
+        self.phases = dict.fromkeys(self.PHASES, 0.0)
+        self._depth = dict.fromkeys(self.PHASES, 0)
+        self._lock = threading.Lock()
+
+    def add_query(self, duration):
+        with self._lock:
+            self.queries += 1
+            self.db += duration
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self):
+        entries = [f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"']
+        entries += [f"{phase};dur={self.phases[phase] * 1000:.2f}" for phase in self.PHASES if self.phases[phase]]
+        entries.append(f"total;dur={self.total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Add the time of the block to a phase of the current request.
+    - No-op outside sampled requests; nested blocks of the same phase count once
+    """
+    timings = _current.get()
+    if timings is None or timings._depth[phase]:
+        yield
+        return
+    timings._depth[phase] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[phase] += time.perf_counter() - start
+        timings._depth[phase] -= 1
+
+
+def time_queries(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(time.perf_counter() - start)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+def _wrap_method(cls, name, phase):
+    original = getattr(cls, name)
+
+    def method(self, *args, **kwargs):
+        if _current.get() is None:
+            return original(self, *args, **kwargs)
+        with timed(phase):
+            return original(self, *args, **kwargs)
+    method.__wrapped__ = original
+    setattr(cls, name, method)
+
+
+def _wrap_property(cls, name, phase):
+    original = getattr(cls, name)
+
+    def getter(self):
+        if _current.get() is None:
+            return original.fget(self)
+        with timed(phase):
+            return original.fget(self)
+    setattr(cls, name, property(getter, doc=original.__doc__))
+
+
+_installed = False
+
+
+def instrument():
+    """
+    Install the DRF hooks and the query timer, once per process.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    from rest_framework.response import Response
+    from rest_framework.serializers import BaseSerializer
+    from rest_framework.views import APIView
+
+    _wrap_method(APIView, "perform_authentication", "auth")
+    _wrap_method(APIView, "check_permissions", "perm")
+    _wrap_method(APIView, "check_object_permissions", "perm")
+    # Serializer.data and ListSerializer.data both end in BaseSerializer.data
+    _wrap_property(BaseSerializer, "data", "serialize")
+    _wrap_property(Response, "rendered_content", "render")
+    connection_created.connect(install_query_timer, dispatch_uid="request_query_timer")
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(None, connection)
+
+
+class RequestMetrics:
+    """
+    Per-route aggregates of the sampled requests of this process.
+    - Duration histogram, query/db/phase sums and status counts per
+      (route, method)
+    - Rendered in the Prometheus text format; every process (worker) keeps
+      its own numbers
+    """
+
+    def __init__(self, buckets_ms, sample_rate):
+        self.buckets = sorted(buckets_ms)
+        self.sample_rate = sample_rate
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, method, status_code, timings):
+        duration = timings.total * 1000
+        with self._lock:
+            entry = self._routes.get((route, method))
+            if entry is None:
+                entry = self._routes[(route, method)] = {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum": 0.0,
+                    "queries": 0,
+                    "db": 0.0,
+                    "phases": dict.fromkeys(RequestTimings.PHASES, 0.0),
+                    "status": {},
+                }
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    entry["buckets"][index] += 1
+            entry["count"] += 1
+            entry["sum"] += duration
+            entry["queries"] += timings.queries
+            entry["db"] += timings.db * 1000
+            for phase, value in timings.phases.items():
+                entry["phases"][phase] += value * 1000
+            status = f"{status_code // 100}xx"
+            entry["status"][status] = entry["status"].get(status, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self):
+        with self._lock:
+            routes = {key: {**entry, "buckets": list(entry["buckets"]), "phases": dict(entry["phases"]),
+                            "status": dict(entry["status"])} for key, entry in self._routes.items()}
+        lines = [
+            "# HELP request_metrics_sample_rate Share of requests that are measured.",
+            "# TYPE request_metrics_sample_rate gauge",
+            f"request_metrics_sample_rate {self.sample_rate}",
+            "# HELP http_request_duration_ms Duration of sampled requests below the middleware.",
+            "# TYPE http_request_duration_ms histogram",
+        ]
+        for (route, method), entry in sorted(routes.items()):
+            labels = f'route="{route}",method="{method}"'
+            for bound, count in zip(self.buckets, entry["buckets"]):
+                lines.append(f'http_request_duration_ms_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_ms_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+            lines.append(f"http_request_duration_ms_sum{{{labels}}} {entry['sum']:.3f}")
+            lines.append(f"http_request_duration_ms_count{{{labels}}} {entry['count']}")
+        lines += ["# HELP http_request_queries_total SQL queries of sampled requests.",
+                  "# TYPE http_request_queries_total counter"]
+        for (route, method), entry in sorted(routes.items()):
+            lines.append(f'http_request_queries_total{{route="{route}",method="{method}"}} {entry["queries"]}')
+        lines += ["# HELP http_request_phase_ms_total Time of sampled requests per phase.",
+                  "# TYPE http_request_phase_ms_total counter"]
+        for (route, method), entry in sorted(routes.items()):
+            phases = {"db": entry["db"], **entry["phases"]}
+            for phase, value in phases.items():
+                lines.append(f'http_request_phase_ms_total{{route="{route}",method="{method}",phase="{phase}"}} {value:.3f}')
+        lines += ["# HELP http_requests_sampled_total Sampled requests per status class.",
+                  "# TYPE http_requests_sampled_total counter"]
+        for (route, method), entry in sorted(routes.items()):
+            for status, count in sorted(entry["status"].items()):
+                lines.append(f'http_requests_sampled_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+_config = metrics_config()
+request_metrics = RequestMetrics(buckets_ms=_config["BUCKETS_MS"], sample_rate=_config["SAMPLE_RATE"])
+
+
+class ServerTimingMiddleware:
+    """
+    Measure sampled requests, see the module docstring.
+    - Place it first in MIDDLEWARE so "total" covers the other middleware
+    - Works for sync and async views (the timings travel in a context variable)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        config = metrics_config()
+        self.sample_rate = config["SAMPLE_RATE"]
+        self.force_header = config["FORCE_HEADER"]
+        self.emit_header = config["SERVER_TIMING_HEADER"]
+        self.public = config["PUBLIC"]
+        instrument()
+
+    def sample(self, request):
+        """
+        Return (measure, aggregate) for the request.
+        """
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True, True
+        forced = bool(self.force_header) and request.headers.get(self.force_header) == "1"
+        return forced, False
+
+    def expose(self, request):
+        """
+        Whether the Server-Timing header may be sent for the request.
+        - Checked after the view, which authenticated the user
+        """
+        if not self.emit_header:
+            return False
+        if self.public or settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        return user is not None and user.is_staff
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        measure, aggregate = self.sample(request)
+        if not measure:
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, aggregate, self.expose(request))
+
+    async def __acall__(self, request):
+        measure, aggregate = self.sample(request)
+        if not measure:
+            return await self.get_response(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        # request.user may still be the lazy session user, loaded synchronously
+        expose = await sync_to_async(self.expose)(request)
+        return self.finish(request, response, timings, aggregate, expose)
+
+    def finish(self, request, response, timings, aggregate, expose):
+        timings.finish()
+        if expose:
+            response["Server-Timing"] = timings.server_timing()
+        if aggregate:
+            match = request.resolver_match
+            route = f"/{match.route}" if match is not None else "unmatched"
+            request_metrics.observe(route, request.method, response.status_code, timings)
+        return response
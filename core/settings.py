@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.ServerTimingMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -78,13 +81,101 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# CONN_MAX_AGE / CONN_HEALTH_CHECKS set the connection reuse per alias:
+# seconds a connection is kept open (0 = one per request, None = unlimited)
+# and whether a reused connection is checked first. Under ASGI keep 0 and
+# use the database server's pooling instead.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
     }
 }
 
+# Local read replica stand-in: a second SQLite file, refreshed from the
+# primary with "python manage.py sync_replicas". Enabled with
+# KANBAN_SQLITE_REPLICA=1; tests mirror it onto the primary.
+if os.environ.get('KANBAN_SQLITE_REPLICA'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    }
+
+# Read replicas (core.db_router): aliases serving the safe-method reads of
+# the PATH_PREFIXES, seconds a client reads from the primary after a write,
+# cache alias remembering those clients (use a shared cache backend when
+# running several processes)
+DATABASE_ROUTING = {
+    'REPLICAS': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': 5,
+    'PATH_PREFIXES': ['/api/'],
+    'CACHE_ALIAS': 'default',
+}
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Serialized board detail payloads (kanban_app.api.response_cache)
+    'board_detail': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'board-detail',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+    'auth_tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-tokens',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+KANBAN_BOARD_CACHE = {
+    'ALIAS': 'board_detail',
+}
+
+# Token -> user snapshots (auth_app.api.authentication.CachedTokenAuthentication).
+# Logout, deactivation and password changes evict the entries of the cache
+# alias; with the per-process LocMem backend only in the process handling that
+# request, other processes keep accepting the token until TIMEOUT. Keep
+# TIMEOUT short with LocMem, point ALIAS at a shared cache backend (Redis,
+# Memcached) for immediate eviction across processes and a longer TIMEOUT.
+AUTH_TOKEN_CACHE = {
+    'ALIAS': 'auth_tokens',
+    'TIMEOUT': 10,
+}
+
+
+AUTHENTICATION_BACKENDS = [
+    'django.contrib.auth.backends.ModelBackend',
+    'auth_app.backends.EmailBackend',
+]
+
+# Unknown login emails remembered for TIMEOUT seconds (auth_app.backends), 0 = off.
+# Opt-in: registration only drops the entry from the cache of its own process,
+# so enable it only with an ALIAS on a shared backend (Redis/Memcached).
+AUTH_UNKNOWN_EMAIL_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 0,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -127,7 +218,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication'
+        'auth_app.api.authentication.CachedTokenAuthentication'
     ]
 }
 
@@ -139,6 +230,114 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
     'authorization',  
+    'if-none-match',
+    'x-request-timing',
 ]
 
-CORS_ALLOW_CREDENTIALS = True  
\ No newline at end of file
+# Let the frontend read the validators for conditional polling
+CORS_EXPOSE_HEADERS = ['ETag', 'Server-Timing']
+
+CORS_ALLOW_CREDENTIALS = True  
+# Board membership results cached across requests (kanban_app.membership)
+KANBAN_MEMBERSHIP_CACHE = {
+    'MAX_ENTRIES': 10000,
+    'TIMEOUT': 60,
+}
+
+# Cursor pagination for task and comment lists (kanban_app.api.pagination)
+KANBAN_PAGINATION = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 500,
+}
+
+# Member picker email lookups (kanban_app.user_lookup): addresses per batch
+# request, minimum prefix length and result count of the typeahead, cache
+# alias and seconds typeahead results are reused
+KANBAN_EMAIL_LOOKUP = {
+    'MAX_EMAILS': 100,
+    'PREFIX_MIN_LENGTH': 3,
+    'PREFIX_LIMIT': 10,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 30,
+}
+
+# Maximum number of tasks per bulk create / bulk move request
+KANBAN_BULK_MAX_ITEMS = 500
+
+# Threads hashing passwords during registration (auth_app.api.hashing), 0 = inline
+AUTH_PASSWORD_HASH_WORKERS = 4
+
+# Serve the kanban read endpoints with the async views (run under ASGI)
+KANBAN_ASYNC_VIEWS = False
+
+# Board change feed (kanban_app.events): notification buffer per connection,
+# open streams per process, keep-alive and long-poll timeouts in seconds
+KANBAN_EVENTS = {
+    'BUFFER_SIZE': 16,
+    'MAX_SUBSCRIBERS': 10000,
+    'HEARTBEAT': 15,
+    'LONG_POLL_TIMEOUT': 25,
+    'BATCH_SIZE': 100,
+}
+
+# Delta sync (kanban_app.sync): seconds a sync token lies in the past, days
+# tombstones are kept before older tokens require a full sync
+KANBAN_SYNC = {
+    'OVERLAP': 5,
+    'TOMBSTONE_DAYS': 30,
+}
+
+# Task and comment search (kanban_app.search): backend ("auto" = SQLite FTS5
+# where available, else the ORM fallback, or a dotted path), terms per
+# query, boards up to which the access check is part of the FTS query,
+# rows per chunk of rebuild_search_index
+KANBAN_SEARCH = {
+    'BACKEND': 'auto',
+    'MAX_TERMS': 8,
+    'SCOPE_TOKENS': 100,
+    'CHUNK_SIZE': 2000,
+}
+
+# Board export (kanban_app.api.export): rows per query, bytes per chunk
+# sent to the client
+KANBAN_EXPORT = {
+    'CHUNK_SIZE': 2000,
+    'FLUSH_BYTES': 64 * 1024,
+}
+
+# NDJSON import (kanban_app.importer): lines per transaction, task ids of the
+# input that comments can refer to, errors and warnings listed in the report
+KANBAN_IMPORT = {
+    'BATCH_SIZE': 2000,
+    'TASK_REFS': 100_000,
+    'MAX_ISSUES': 100,
+}
+
+# Task archiving (kanban_app.archive): days a done task has to be unchanged
+# before archive_tasks moves it, tasks per batch (transaction)
+KANBAN_ARCHIVE = {
+    'AFTER_DAYS': 90,
+    'BATCH_SIZE': 500,
+}
+
+# Background purge of deleted boards and orphaned rows (kanban_app.purge):
+# rows per batch (transaction), worker threads per process (0 = inline after
+# the commit), seconds before a claimed job of a dead worker is taken over
+KANBAN_PURGE = {
+    'BATCH_SIZE': 500,
+    'WORKERS': 1,
+    'LEASE': 300,
+}
+
+# Request instrumentation (core.instrumentation): share of requests measured
+# and aggregated for /api/metrics/, request header forcing a measurement
+# ("1"), Server-Timing response header, histogram buckets in ms.
+# The Server-Timing header is only sent in DEBUG and to staff users unless
+# PUBLIC is set, it shows query counts and durations (also of /api/login/).
+REQUEST_METRICS = {
+    'SAMPLE_RATE': 0.05,
+    'FORCE_HEADER': 'X-Request-Timing',
+    'SERVER_TIMING_HEADER': True,
+    'PUBLIC': False,
+    'BUCKETS_MS': [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000],
+}
@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
+from .views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     path('api/', include('auth_app.api.urls')),
     path('api/', include('kanban_app.api.urls')),
     path('api-auth' , include('rest_framework.urls'))
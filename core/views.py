@@ -0,0 +1,16 @@
+from django.http import HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from .instrumentation import request_metrics
+
+
+class MetricsView(APIView):
+    """
+    API endpoint exposing the request metrics of this process.
+    - Prometheus text format, scraped with an admin token
+    - Only randomly sampled requests are counted (see REQUEST_METRICS)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,321 @@
+"""
+Async variants of the read endpoints for the ASGI application.
+
+The views use Django's async ORM and async membership checks. Querysets are
+fully loaded (including prefetches) before the DRF serializers run, so
+serialization never touches the database. Writes keep using the sync views,
+see read_switch(). Enabled with KANBAN_ASYNC_VIEWS (see kanban_app.api.urls).
+The board event feed (board_events) is always served from here.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.authentication import get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from kanban_app.archive import include_archived
+from kanban_app.events import event_broker, events_after, events_config, latest_event_id
+from kanban_app.models import Boards, Comment, DashboardTasks
+from kanban_app.membership import ais_board_member
+from kanban_app.stats import rebuild_board_stats
+from auth_app.api.authentication import token_cache
+from core.db_router import reading_from_replica, use_primary
+from core.instrumentation import timed
+from .conditional import board_etag, etag_matches, make_etag
+from .pagination import CommentCursorPagination, TaskCursorPagination
+from .projections import comment_rows, comments_data, task_rows, tasks_data
+from .response_cache import board_response_cache
+from .serializer import BoardDetailSerializer, BoardsSerializer
+from .views import board_detail_queryset, task_list_versions, user_boards
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    with timed("render"):
+        content = JSONRenderer().render(data)
+    return HttpResponse(
+        content,
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def error_response(status_code, detail, headers=None):
+    return json_response({"detail": detail}, status_code, headers)
+
+
+def not_modified(etag):
+    return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+async def aauthenticate(request):
+    """
+    Resolve the user of a "Token <key>" Authorization header.
+    - Uses the same token cache as CachedTokenAuthentication
+    - Returns None for missing, invalid or inactive tokens
+    """
+    auth = get_authorization_header(request).split()
+    if len(auth) != 2 or auth[0].lower() != b"token":
+        return None
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        return None
+    user = token_cache.get_user(key)
+    if user is not None:
+        return user
+    try:
+        token = await Token.objects.select_related("user").aget(key=key)
+    except Token.DoesNotExist:
+        if not reading_from_replica():
+            return None
+        # Created a moment ago (login, registration), not on the replica yet
+        with use_primary():
+            try:
+                token = await Token.objects.select_related("user").aget(key=key)
+            except Token.DoesNotExist:
+                return None
+    if not token.user.is_active:
+        return None
+    token_cache.set_user(key, token.user)
+    return token.user
+
+
+def async_read_view(handler):
+    """
+    Wrap an async GET handler with token authentication.
+    """
+    async def view(request, *args, **kwargs):
+        with timed("auth"):
+            user = await aauthenticate(request)
+        if user is None:
+            return error_response(
+                status.HTTP_401_UNAUTHORIZED,
+                "Authentication credentials were not provided.",
+                headers={"WWW-Authenticate": "Token"},
+            )
+        request.user = user
+        return await handler(request, *args, **kwargs)
+    return view
+
+
+def read_switch(async_get, sync_view):
+    """
+    Serve GET with the async handler and every other method with the sync view.
+    - Reads of archived tasks (?include_archived=1) are left to the sync view
+    """
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method == "GET" and not include_archived(request.GET):
+            return await async_get(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+    return csrf_exempt(view)
+
+
+async def paginate(paginator, queryset, request):
+    # CursorPagination evaluates the page synchronously and needs a DRF request
+    drf_request = Request(request)
+    page = await sync_to_async(paginator.paginate_queryset)(queryset, drf_request)
+    return page
+
+
+@async_read_view
+async def board_list(request):
+    boards = user_boards(request.user)
+    versions = [row async for row in boards.order_by("pk").values_list("pk", "version")]
+    etag = make_etag("boards", request.user.pk, *versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    boards = [board async for board in boards]
+    missing = [board.pk for board in boards if not hasattr(board, "stats")]
+    if missing:
+        # Boards without a stats row would be counted lazily during serialization
+        await sync_to_async(rebuild_board_stats)(missing)
+        boards = [board async for board in user_boards(request.user)]
+    return json_response(BoardsSerializer(boards, many=True).data, headers={"ETag": etag})
+
+
+@async_read_view
+async def board_detail(request, pk):
+    try:
+        board = await Boards.objects.only("id", "owner_id", "version").aget(pk=pk)
+    except Boards.DoesNotExist:
+        return error_response(status.HTTP_404_NOT_FOUND, "No Boards matches the given query.")
+    if not await ais_board_member(request.user, board, request):
+        return error_response(status.HTTP_403_FORBIDDEN, "You do not have permission to perform this action.")
+    etag = board_etag(board)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    data = board_response_cache.get(board)
+    cache_status = "HIT"
+    if data is None:
+        full_board = await board_detail_queryset().aget(pk=pk)
+        data = BoardDetailSerializer(full_board, context={"request": request}).data
+        board_response_cache.set(board, data)
+        cache_status = "MISS"
+    return json_response(data, headers={"ETag": etag, "X-Cache": cache_status})
+
+
+def user_task_list(field):
+    @async_read_view
+    async def view(request):
+        # The join does not apply the Boards manager, leave out deleted boards
+        tasks = DashboardTasks.objects.filter(board__deleted_at__isnull=True, **{field: request.user})
+        versions = [row async for row in task_list_versions(tasks)]
+        etag = make_etag("tasks", request.get_full_path(), *versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        paginator = TaskCursorPagination()
+        page = await paginate(paginator, task_rows(tasks), request)
+        response = paginator.get_paginated_response(tasks_data(page))
+        return json_response(response.data, headers={"ETag": etag})
+    return view
+
+
+assigned_tasks = user_task_list("assignee_id")
+reviewing_tasks = user_task_list("reviewer_id")
+
+
+@async_read_view
+async def task_comments(request, task_pk):
+    try:
+        task = await DashboardTasks.objects.only("id", "board_id").aget(pk=task_pk)
+    except DashboardTasks.DoesNotExist:
+        return error_response(status.HTTP_404_NOT_FOUND, "No DashboardTasks matches the given query.")
+    if not task.board_id:
+        return error_response(status.HTTP_403_FORBIDDEN, "Task is not assigned to a board.")
+    if not await ais_board_member(request.user, task.board_id, request):
+        return error_response(status.HTTP_403_FORBIDDEN, "User must be a member of the board to view comments.")
+
+    paginator = CommentCursorPagination()
+    comments = comment_rows(Comment.objects.filter(task_id=task.pk))
+    page = await paginate(paginator, comments, request)
+    response = paginator.get_paginated_response(comments_data(page))
+    return json_response(response.data)
+
+
+def event_cursor(request):
+    """
+    Read the feed cursor from Last-Event-ID or ?after=, None if there is none.
+    """
+    value = request.headers.get("Last-Event-ID") or request.GET.get("after")
+    try:
+        return max(int(value), 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+async def aevents_after(board_id, cursor, limit):
+    # Notifications follow commits on the primary, a replica may lag behind
+    with use_primary():
+        return [event async for event in events_after(board_id, cursor, limit)]
+
+
+def format_event(event):
+    data = json.dumps({"kind": event["kind"], **event["payload"], "at": event["created_at"]}, cls=DjangoJSONEncoder)
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {data}\n\n"
+
+
+def drain(queue):
+    while not queue.empty():
+        queue.get_nowait()
+
+
+async def event_stream(request, board_id, cursor, queue, config):
+    """
+    Yield the events after cursor as server-sent events, then wait for new ones.
+    - Wakes up on broker notifications or after HEARTBEAT seconds, sends a
+      comment line as keep-alive and re-checks the membership
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        yield f"retry: {config['HEARTBEAT'] * 1000}\n\n"
+        while True:
+            events = await aevents_after(board_id, cursor, config["BATCH_SIZE"])
+            for event in events:
+                cursor = event["id"]
+                yield format_event(event)
+            if len(events) == config["BATCH_SIZE"]:
+                continue
+            try:
+                await asyncio.wait_for(queue.get(), config["HEARTBEAT"])
+                drain(queue)
+            except asyncio.TimeoutError:
+                if not await ais_board_member(request.user, board_id):
+                    return
+                yield ": keep-alive\n\n"
+    finally:
+        event_broker.unsubscribe(board_id, loop, queue)
+
+
+@require_GET
+@async_read_view
+async def board_events(request, pk):
+    """
+    Change feed of a board.
+    - ASGI and Accept: text/event-stream: server-sent events, resumed from
+      the Last-Event-ID header
+    - Otherwise long-poll: returns the events after ?after= as JSON, waiting
+      up to LONG_POLL_TIMEOUT seconds for the first one
+    - Without a cursor the feed starts at the current end of the log
+    """
+    try:
+        board = await Boards.objects.only("id", "owner_id").aget(pk=pk)
+    except Boards.DoesNotExist:
+        return error_response(status.HTTP_404_NOT_FOUND, "No Boards matches the given query.")
+    if not await ais_board_member(request.user, board, request):
+        return error_response(status.HTTP_403_FORBIDDEN, "You do not have permission to perform this action.")
+
+    config = events_config()
+    loop = asyncio.get_running_loop()
+    # Subscribe before reading, so no event between the read and the wait is missed
+    queue = event_broker.subscribe(board.pk, loop, asyncio.Queue)
+    if queue is None:
+        return error_response(status.HTTP_503_SERVICE_UNAVAILABLE, "Too many open event streams.")
+
+    cursor = event_cursor(request)
+    if cursor is None:
+        with use_primary():
+            cursor = await latest_event_id(board.pk).afirst() or 0
+
+    streaming = isinstance(request, ASGIRequest) and "text/event-stream" in request.headers.get("Accept", "")
+    if streaming:
+        response = StreamingHttpResponse(
+            event_stream(request, board.pk, cursor, queue, config),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    try:
+        events = await aevents_after(board.pk, cursor, config["BATCH_SIZE"])
+        if not events:
+            try:
+                await asyncio.wait_for(queue.get(), config["LONG_POLL_TIMEOUT"])
+            except asyncio.TimeoutError:
+                pass
+            else:
+                events = await aevents_after(board.pk, cursor, config["BATCH_SIZE"])
+    finally:
+        event_broker.unsubscribe(board.pk, loop, queue)
+    data = {
+        "events": [
+            {"id": event["id"], "kind": event["kind"], "payload": event["payload"], "created_at": event["created_at"]}
+            for event in events
+        ],
+        "last_event_id": events[-1]["id"] if events else cursor,
+    }
+    return json_response(data)
@@ -0,0 +1,36 @@
+import hashlib
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """
+    Build a weak ETag from the given validator parts.
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return "W/" + quote_etag(digest)
+
+
+def board_etag(board):
+    return make_etag("board", board.pk, board.version)
+
+
+def etag_matches(request, etag):
+    """
+    Return True if the If-None-Match header of the request contains the ETag.
+    - Weak comparison, as specified for If-None-Match
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = parse_etags(header)
+    if "*" in tags:
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == bare for tag in tags)
+
+
+def not_modified(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
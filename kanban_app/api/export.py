@@ -0,0 +1,226 @@
+"""
+Streaming export of a whole board (BoardExportView).
+
+Records are produced one by one: the board, then every task (by id) directly
+followed by its comments (by id). Tasks and comments are read in keyset
+pages of CHUNK_SIZE rows and merged in step, so memory stays constant
+however large the board is. Every page is a short query of its own: an open
+cursor (QuerySet.iterator) would hold SQLite's read lock, and block writers,
+for as long as a slow client downloads. Users are exported by email.
+?include_archived=1 adds the archived tasks (kanban_app.archive).
+"""
+import csv
+import io
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, Value
+from rest_framework.renderers import BaseRenderer
+from kanban_app.models import ArchivedComment, ArchivedTask, Comment, DashboardTasks
+from .pagination import MergedRows
+
+CSV_COLUMNS = (
+    "record", "id", "task", "title", "description", "status", "priority", "due_date", "archived",
+    "assignee", "reviewer", "author", "content", "owner", "members", "created_at", "updated_at",
+)
+
+
+def export_config():
+    config = {
+        "CHUNK_SIZE": 2000,
+        "FLUSH_BYTES": 64 * 1024,
+    }
+    config.update(getattr(settings, "KANBAN_EXPORT", {}))
+    return config
+
+
+def keyset_pages(queryset, fields, chunk_size):
+    """
+    Yield the rows of a values() queryset ordered by fields in pages of
+    chunk_size rows, one query per page.
+    """
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            # (a, b) > (x, y): a > x, or a = x and b > y
+            after = Q()
+            for index, field in enumerate(fields):
+                equal = {previous: last[previous] for previous in fields[:index]}
+                after |= Q(**equal, **{f"{field}__gt": last[field]})
+            page = page.filter(after)
+        rows = list(page.order_by(*fields)[:chunk_size])
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1]
+
+
+def board_record(board):
+    return {
+        "record": "board",
+        "id": board.pk,
+        "title": board.title,
+        "owner": board.owner.email,
+        "members": sorted(board.members.values_list("email", flat=True)),
+        "created_at": board.created_date,
+    }
+
+
+def task_record(row):
+    record = {
+        "record": "task",
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["description"],
+        "status": row["status"],
+        "priority": row["priority"],
+        "due_date": row["due_date"],
+        "assignee": row["assignee_id__email"],
+        "reviewer": row["reviewer_id__email"],
+        "updated_at": row["updated_at"],
+    }
+    if "archived" in row:
+        record["archived"] = row["archived"]
+    return record
+
+
+def comment_record(row):
+    return {
+        "record": "comment",
+        "id": row["id"],
+        "task": row["task_id"],
+        "author": row["author__email"],
+        "content": row["content"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def board_records(board, after=0, chunk_size=None, archived=False):
+    """
+    Generate the export records of a board.
+    - after: resume behind this task id (the board record is always sent)
+    - archived: include the archived tasks and comments, merged in id order
+      and marked with "archived"
+    - The comments of each page of tasks are read by task id (also in
+      pages), every query stays bounded by the page
+    """
+    chunk_size = chunk_size or export_config()["CHUNK_SIZE"]
+    task_fields = (
+        "id", "title", "description", "status", "priority", "due_date",
+        "assignee_id__email", "reviewer_id__email", "updated_at",
+    )
+    comment_fields = ("id", "task_id", "author__email", "content", "created_at", "updated_at")
+    tasks = DashboardTasks.objects.filter(board_id=board.pk, pk__gt=after).values(*task_fields)
+    comments = Comment.objects.values(*comment_fields)
+    if archived:
+        tasks = MergedRows(
+            tasks.annotate(archived=Value(False)).values(*task_fields, "archived"),
+            ArchivedTask.objects.filter(board_id=board.pk, pk__gt=after).annotate(archived=Value(True))
+            .values(*task_fields, "archived"),
+        )
+        comments = MergedRows(comments, ArchivedComment.objects.values(*comment_fields))
+    yield board_record(board)
+    for page in keyset_pages(tasks, ("id",), chunk_size):
+        task_comments = itertools.chain.from_iterable(
+            keyset_pages(comments.filter(task_id__in=[task["id"] for task in page]), ("task_id", "id"), chunk_size)
+        )
+        pending = next(task_comments, None)
+        for task in page:
+            yield task_record(task)
+            while pending is not None and pending["task_id"] == task["id"]:
+                yield comment_record(pending)
+                pending = next(task_comments, None)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    One JSON object per line; also renders error responses as one line.
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def encode(self, record):
+        return json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+    def header(self):
+        return ""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return self.encode(data).encode()
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    One row per record with the union of all columns (CSV_COLUMNS).
+    """
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.encoder = DjangoJSONEncoder()
+
+    def row(self, values):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(values)
+        return self.buffer.getvalue()
+
+    def value(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return " ".join(value)
+        if hasattr(value, "isoformat"):
+            # Same format as the JSON exports
+            return self.encoder.default(value)
+        return value
+
+    def encode(self, record):
+        return self.row([self.value(record.get(column)) for column in CSV_COLUMNS])
+
+    def header(self):
+        return self.row(CSV_COLUMNS)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        data = data if isinstance(data, dict) else {"detail": data}
+        return (self.row(list(data)) + self.row(list(data.values()))).encode()
+
+
+def encoded_chunks(records, renderer, flush_bytes=None):
+    """
+    Encode records and yield them in chunks of about flush_bytes.
+    """
+    flush_bytes = flush_bytes or export_config()["FLUSH_BYTES"]
+    parts = [renderer.header()]
+    size = len(parts[0])
+    for record in records:
+        line = renderer.encode(record)
+        parts.append(line)
+        size += len(line)
+        if size >= flush_bytes:
+            yield "".join(parts).encode()
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts).encode()
+
+
+async def async_chunks(chunks):
+    """
+    Serve a sync chunk generator to an ASGI server chunk by chunk.
+    - StreamingHttpResponse would otherwise consume a sync iterator
+      completely before sending it
+    """
+    chunks = iter(chunks)
+    pull = sync_to_async(next)
+    while (chunk := await pull(chunks, None)) is not None:
+        yield chunk
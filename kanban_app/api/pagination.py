@@ -0,0 +1,59 @@
+import heapq
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+PAGINATION = getattr(settings, "KANBAN_PAGINATION", {})
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination with an opaque cursor.
+    - Pages filter on the ordering key instead of using OFFSET, so deep
+      pages cost the same as the first one
+    - The id is always the last ordering column, which keeps the order
+      stable while new rows are inserted
+    - Page size via ?page_size=, limited by MAX_PAGE_SIZE
+    """
+    page_size = PAGINATION.get("PAGE_SIZE", 50)
+    max_page_size = PAGINATION.get("MAX_PAGE_SIZE", 500)
+    page_size_query_param = "page_size"
+
+
+class TaskCursorPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class CommentCursorPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+
+
+class MergedRows:
+    """
+    The .values() rows of several querysets with the same columns (e.g. live
+    and archived tasks), merged in their common ordering.
+    - Implements what the cursor paginations and keyset walks use: order_by,
+      filter and slicing
+    - A slice [start:stop] reads at most stop rows from every queryset
+    """
+
+    def __init__(self, *querysets, ordering=("id",)):
+        self.querysets = querysets
+        self.ordering = ordering
+
+    def order_by(self, *ordering):
+        return MergedRows(*(queryset.order_by(*ordering) for queryset in self.querysets), ordering=ordering)
+
+    def filter(self, *args, **kwargs):
+        return MergedRows(*(queryset.filter(*args, **kwargs) for queryset in self.querysets), ordering=self.ordering)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.stop is None:
+            raise TypeError("MergedRows only supports bounded slices.")
+        fields = [field.lstrip("-") for field in self.ordering]
+        rows = heapq.merge(
+            *(list(queryset[:index.stop]) for queryset in self.querysets),
+            key=lambda row: [row[field] for field in fields],
+            reverse=self.ordering[0].startswith("-"),
+        )
+        return list(rows)[index.start or 0:index.stop]
@@ -0,0 +1,141 @@
+"""
+Read path for task and comment lists without the DRF field machinery.
+
+The list endpoints fetch flat .values() rows (users joined in the same
+query) and turn them into the JSON shape of TasksSerializer, CommentSerializer
+and ChangedCommentSerializer with plain row mappers. Dates and datetimes
+still go through DRF's own field classes, so format and timezone settings
+apply unchanged. ProjectionContractTests (kanban_app.tests) compares both
+paths byte for byte, the verify_projections command does the same on real
+data and times them.
+"""
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+from kanban_app.models import Comment, DashboardTasks
+
+USER_COLUMNS = ("id", "email", "first_name", "last_name")
+
+TASK_COLUMNS = (
+    "id", "board_id", "title", "description", "status", "priority", "due_date", "comments_count",
+    *(f"assignee_id__{column}" for column in USER_COLUMNS),
+    *(f"reviewer_id__{column}" for column in USER_COLUMNS),
+)
+
+COMMENT_COLUMNS = ("id", "task_id", "created_at", "content", "author__first_name", "author__last_name")
+
+
+def comments_count_subquery(comments=Comment):
+    """
+    Correlated count of the outer task's comments (Comment or ArchivedComment).
+    - Unlike Count("comments") it needs no GROUP BY over all matching tasks,
+      so a cursor page stops after page_size rows
+    """
+    return Coalesce(
+        Subquery(
+            comments.objects.filter(task=OuterRef("pk"))
+            .order_by()
+            .values("task")
+            .annotate(total=Count("pk"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def task_rows(tasks=None, archived=False):
+    """
+    Flat rows of a DashboardTasks (or ArchivedTask) queryset, with assignee,
+    reviewer and the comment count in one query.
+    - archived: add an "archived" column (lists with ?include_archived=1)
+    """
+    tasks = DashboardTasks.objects.all() if tasks is None else tasks
+    comments = tasks.model._meta.get_field("comments").related_model
+    tasks = tasks.annotate(comments_count=comments_count_subquery(comments))
+    if archived:
+        tasks = tasks.annotate(archived=Value(tasks.model is not DashboardTasks))
+        return tasks.values(*TASK_COLUMNS, "archived")
+    return tasks.values(*TASK_COLUMNS)
+
+
+def comment_rows(comments=None):
+    """
+    Flat rows of a Comment queryset, with the author's name in one query.
+    """
+    comments = Comment.objects.all() if comments is None else comments
+    return comments.values(*COMMENT_COLUMNS)
+
+
+def full_name(first_name, last_name):
+    # Same as User.get_full_name()
+    return f"{first_name} {last_name}".strip()
+
+
+def _user_mapper(prefix):
+    user_id, email, first_name, last_name = (f"{prefix}__{column}" for column in USER_COLUMNS)
+
+    def user(row):
+        if row[user_id] is None:
+            return None
+        return {"id": row[user_id], "email": row[email], "fullname": full_name(row[first_name], row[last_name])}
+    return user
+
+
+def _task_mapper():
+    date = serializers.DateField().to_representation
+    assignee = _user_mapper("assignee_id")
+    reviewer = _user_mapper("reviewer_id")
+
+    def task(row):
+        data = {
+            "id": row["id"],
+            "board": row["board_id"],
+            "title": row["title"],
+            "description": row["description"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "assignee": assignee(row),
+            "reviewer": reviewer(row),
+            "due_date": date(row["due_date"]),
+            "comments_count": row["comments_count"],
+        }
+        if "archived" in row:
+            data["archived"] = row["archived"]
+        return data
+    return task
+
+
+def _comment_mapper(with_task):
+    datetime = serializers.DateTimeField().to_representation
+
+    def comment(row):
+        data = {
+            "id": row["id"],
+            "created_at": datetime(row["created_at"]),
+            "author": full_name(row["author__first_name"], row["author__last_name"]),
+            "content": row["content"],
+        }
+        if with_task:
+            data["task"] = row["task_id"]
+        return data
+    return comment
+
+
+task_data = _task_mapper()
+comment_data = _comment_mapper(with_task=False)
+changed_comment_data = _comment_mapper(with_task=True)
+
+
+def tasks_data(rows):
+    """
+    TasksSerializer(many=True).data of the tasks behind task_rows().
+    """
+    return [task_data(row) for row in rows]
+
+
+def comments_data(rows, with_task=False):
+    """
+    CommentSerializer (or ChangedCommentSerializer) data of comment_rows().
+    """
+    mapper = changed_comment_data if with_task else comment_data
+    return [mapper(row) for row in rows]
@@ -0,0 +1,66 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class BoardResponseCache:
+    """
+    Cache for serialized board detail payloads.
+    - One entry per board holding (version, data); an entry is only used
+      while the board still has the same version
+    - Backed by a Django cache alias, so eviction and size limits come from
+      its MAX_ENTRIES / TIMEOUT settings (local-memory or file backends work)
+    - Counts hits and misses of this process
+    """
+
+    def __init__(self, alias, timeout=None):
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, board_id):
+        return f"board-detail:{board_id}"
+
+    def get(self, board):
+        entry = self.cache.get(self.key(board.pk))
+        hit = entry is not None and entry[0] == board.version
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry[1] if hit else None
+
+    def set(self, board, data):
+        if self.timeout is None:
+            self.cache.set(self.key(board.pk), (board.version, data))
+        else:
+            self.cache.set(self.key(board.pk), (board.version, data), self.timeout)
+
+    def invalidate(self, *board_ids):
+        keys = [self.key(board_id) for board_id in board_ids if board_id]
+        if keys:
+            self.cache.delete_many(keys)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+            }
+
+
+_config = getattr(settings, "KANBAN_BOARD_CACHE", {})
+board_response_cache = BoardResponseCache(
+    alias=_config.get("ALIAS", "default"),
+    timeout=_config.get("TIMEOUT"),
+)
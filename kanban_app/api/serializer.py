@@ -37,6 +37,9 @@ class TasksSerializer(serializers.ModelSerializer):
    
 
     def get_comments_count(self, obj):
+        # Annotated by the board detail query plan, counted per task otherwise
+        if hasattr(obj, "comments_count"):
+            return obj.comments_count
         return obj.comments.count()
 
     class Meta:
@@ -54,6 +57,30 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         model = DashboardTasks
         fields = ['id' ,'title','description','status', 'priority','assignee', 'assignee_id', 'reviewer', 'reviewer_id', 'due_date']
 
+class BulkTaskCreateSerializer(serializers.ModelSerializer):
+    """
+    Validates one task of a bulk create without database lookups.
+    - board, assignee_id and reviewer_id are plain ids here, the view
+      resolves all of them with one query per model
+    """
+    board = serializers.IntegerField()
+    assignee_id = serializers.IntegerField()
+    reviewer_id = serializers.IntegerField()
+
+    class Meta:
+        model = DashboardTasks
+        fields = ['board', 'title', 'description', 'status', 'priority', 'assignee_id', 'reviewer_id', 'due_date']
+
+class BulkTaskUpdateSerializer(serializers.Serializer):
+    """
+    Validates one entry of a bulk move: the task id and the fields to change.
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=DashboardTasks.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=DashboardTasks.PRIORITY_CHOICES, required=False)
+    assignee_id = serializers.IntegerField(required=False)
+    reviewer_id = serializers.IntegerField(required=False)
+
 class BoardsMixin(serializers.Serializer):
     """
     Serializer fields for additional board metrics
@@ -61,6 +88,8 @@ class BoardsMixin(serializers.Serializer):
     - ticket_count: total number of tasks
     - tasks_to_do_count: number of tasks with status 'To Do'
     - tasks_high_prio_count: number of high-priority tasks
+    Values are read from the board's BoardStats row, boards without one
+    are counted directly.
     """
     member_count = serializers.SerializerMethodField()
     ticket_count = serializers.SerializerMethodField()
@@ -68,19 +97,31 @@ class BoardsMixin(serializers.Serializer):
     tasks_high_prio_count = serializers.SerializerMethodField()
 
     def get_member_count(self, obj):
+        stats = getattr(obj, "stats", None)
+        if stats is not None:
+            return stats.member_count
         return obj.members.count()
 
     def get_ticket_count(self, obj):
+        stats = getattr(obj, "stats", None)
+        if stats is not None:
+            return stats.ticket_count
         return obj.tasks.count()
 
     def get_tasks_to_do_count(self, obj):
+        stats = getattr(obj, "stats", None)
+        if stats is not None:
+            return stats.tasks_to_do_count
         return obj.tasks.filter(status="to-do").count()
 
     def get_tasks_high_prio_count(self, obj):
+        stats = getattr(obj, "stats", None)
+        if stats is not None:
+            return stats.tasks_high_prio_count
         return obj.tasks.filter(priority="high").count()
     
 class OwnerIdMixin(serializers.Serializer):
-    owner_id = serializers.ReadOnlyField(source="owner.id")
+    owner_id = serializers.ReadOnlyField()
 
 class BoardsSerializer(BoardsMixin,OwnerIdMixin, serializers.ModelSerializer):
     """
@@ -163,3 +204,12 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id','created_at', 'author', 'content']
         read_only_fields = ['created_at', 'author']
 
+
+class ChangedCommentSerializer(CommentSerializer):
+    """
+    Comment in a delta sync response, with the id of its task.
+    """
+    task = serializers.ReadOnlyField(source="task_id")
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['task']
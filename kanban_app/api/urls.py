@@ -1,26 +1,53 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import  (
     BoardView, 
+    BoardCacheStatsView, 
+    BoardChangesView, 
+    BoardExportView, 
+    BoardImportView, 
     ReviewerTaskView, 
     TaskView, 
+    TaskBulkView, 
     UserEmailList, 
     BoardSingleView, 
     TasksSingleView, 
     AssignedTaskView, 
     TaskCommentsView, 
-    CommentSingleView
+    CommentSingleView,
+    SearchView
 )
 
 # API endpoints for managing users, boards, tasks, and comments
 
-urlpatterns = [
-    path('email-check/', UserEmailList.as_view(), name='email-check'),
-    path('boards/', BoardView.as_view(), name='board'),
-    path('boards/<int:pk>/', BoardSingleView.as_view(), name='board-single-view'),
-    path('tasks/', TaskView.as_view(), name='taskview'),
-    path('tasks/assigned-to-me/', AssignedTaskView.as_view(), name='assigned-task'),
-    path('tasks/reviewing/', ReviewerTaskView.as_view(), name='reviewing'),
-    path('tasks/<int:pk>/', TasksSingleView.as_view(), name='tasksSingleview'),
-    path('tasks/<int:task_pk>/comments/', TaskCommentsView.as_view(), name='task-comments'),
-    path('tasks/<int:task_pk>/comments/<int:pk>/', CommentSingleView.as_view(), name='task-single-comments'),
-]
\ No newline at end of file
+def build_urlpatterns(use_async):
+    """
+    Build the endpoint list for the sync or the async read stack.
+    - Async: GET of the read endpoints is served by kanban_app.api.async_views,
+      other methods of the same routes keep using the sync views
+    """
+    def read(sync_view, async_get):
+        return async_views.read_switch(async_get, sync_view) if use_async else sync_view
+
+    return [
+        path('email-check/', UserEmailList.as_view(), name='email-check'),
+        path('boards/', read(BoardView.as_view(), async_views.board_list), name='board'),
+        path('boards/<int:pk>/', read(BoardSingleView.as_view(), async_views.board_detail), name='board-single-view'),
+        path('boards/cache-stats/', BoardCacheStatsView.as_view(), name='board-cache-stats'),
+        path('boards/<int:pk>/events/', async_views.board_events, name='board-events'),
+        path('boards/<int:pk>/changes/', BoardChangesView.as_view(), name='board-changes'),
+        path('boards/<int:pk>/export/', BoardExportView.as_view(), name='board-export'),
+        path('import/', BoardImportView.as_view(), name='import'),
+        path('tasks/', TaskView.as_view(), name='taskview'),
+        path('tasks/bulk/', TaskBulkView.as_view(), name='task-bulk'),
+        path('tasks/assigned-to-me/', read(AssignedTaskView.as_view(), async_views.assigned_tasks), name='assigned-task'),
+        path('tasks/reviewing/', read(ReviewerTaskView.as_view(), async_views.reviewing_tasks), name='reviewing'),
+        path('tasks/<int:pk>/', TasksSingleView.as_view(), name='tasksSingleview'),
+        path('tasks/<int:task_pk>/comments/', read(TaskCommentsView.as_view(), async_views.task_comments), name='task-comments'),
+        path('tasks/<int:task_pk>/comments/<int:pk>/', CommentSingleView.as_view(), name='task-single-comments'),
+        path('search/', SearchView.as_view(), name='search'),
+    ]
+
+
+urlpatterns = build_urlpatterns(getattr(settings, "KANBAN_ASYNC_VIEWS", False))
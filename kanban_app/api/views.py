@@ -1,47 +1,164 @@
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
-from django.core.validators import validate_email
-from django.core.exceptions import ValidationError, PermissionDenied
-from django.db.models import Q
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status, generics, mixins
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.generics import RetrieveUpdateDestroyAPIView, GenericAPIView, ListCreateAPIView
-from rest_framework.exceptions import NotFound
-from kanban_app.models import Boards, Comment, DashboardTasks
-from .serializer import BoardDetailSerializer, BoardsSerializer, CheckMailSerializer, TaskDetailSerializer, TasksSerializer, CommentSerializer
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
+from rest_framework.utils.urls import replace_query_param
+from kanban_app.archive import include_archived
+from kanban_app.models import ArchivedTask, Boards, Comment, DashboardTasks
+from kanban_app.importer import Importer
+from kanban_app.membership import is_board_member
+from kanban_app.purge import delete_board
+from kanban_app.search import InvalidCursor, decode_cursor, encode_cursor, search_backend, search_terms
+from kanban_app.signals import tasks_changed_in_bulk, tasks_created_in_bulk
+from kanban_app.sync import InvalidToken, changed_since, deleted_ids, next_token, parse_token, token_expired
+from kanban_app.user_lookup import find_users_by_email, lookup_config, users_with_prefix
+from .export import CSVRenderer, NDJSONRenderer, async_chunks, board_records, encoded_chunks
+from .conditional import board_etag, etag_matches, make_etag, not_modified
+from .pagination import CommentCursorPagination, KeysetPagination, MergedRows, TaskCursorPagination
+from .projections import comment_rows, comments_data, task_rows, tasks_data
+from .response_cache import board_response_cache
+from .serializer import (
+    BoardDetailSerializer, BoardsSerializer, BulkTaskCreateSerializer, BulkTaskUpdateSerializer,
+    TaskDetailSerializer, TasksSerializer, CommentSerializer
+)
 from auth_app.api.permissions import IsBoardMemberForTask, IsOwnerOrMemberBoard, IsCommentAuthorOrBoardMember
 
+def task_list_queryset():
+    """
+    Base queryset for tasks rendered with TasksSerializer (board detail).
+    - The task list endpoints use the flat rows of kanban_app.api.projections
+    - assignee/reviewer joined, comments counted in the same query
+    """
+    return (
+        DashboardTasks.objects.select_related("assignee_id", "reviewer_id")
+        .annotate(comments_count=Count("comments"))
+    )
+
+
+def user_boards(user):
+    """
+    Boards of the user joined with their precomputed statistics row.
+    - Membership is matched with a subquery on the membership table
+    """
+    member_boards = Boards.members.through.objects.filter(user=user).values("boards_id")
+    return Boards.objects.filter(Q(owner=user) | Q(pk__in=member_boards)).select_related("stats")
+
+
+def board_detail_queryset():
+    """
+    Query plan for the board detail: the whole board graph in a fixed number of queries.
+    - owner joined, members prefetched once (shared with IsOwnerOrMemberBoard)
+    - tasks prefetched with assignee/reviewer joined and comments counted
+    """
+    return (
+        Boards.objects.select_related("owner")
+        .prefetch_related("members", Prefetch("tasks", queryset=task_list_queryset()))
+    )
+
+
+def task_list_versions(tasks):
+    """
+    Board versions and task counts per board of a task list, in one grouped query.
+    """
+    return (
+        tasks.order_by("board_id")
+        .values_list("board_id", "board__version")
+        .annotate(total=Count("pk"))
+    )
+
+
+def task_list_etag(request, tasks, archived=None):
+    """
+    Validator for a per-user task list.
+    - Derived from the versions of the boards the listed tasks belong to and
+      the number of tasks per board
+    - archived: the archived tasks listed as well, counted the same way
+    - Includes the full path, so every cursor page has its own ETag
+    """
+    versions = list(task_list_versions(tasks))
+    if archived is not None:
+        versions += ["archived", *task_list_versions(archived)]
+    return make_etag("tasks", request.get_full_path(), *versions)
+
+
+def user_task_list(view, request, **lookup):
+    """
+    Cursor paginated list of the requesting user's tasks (assigned, reviewing).
+    - ?include_archived=1 merges the archived tasks into the pages, in id order
+    - Tasks of deleted boards are left out before the purge removes them
+    """
+    tasks = DashboardTasks.objects.filter(board__deleted_at__isnull=True, **lookup)
+    archived = None
+    if include_archived(request.query_params):
+        archived = ArchivedTask.objects.filter(board__deleted_at__isnull=True, **lookup)
+    etag = task_list_etag(request, tasks, archived)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if archived is None:
+        rows = task_rows(tasks)
+    else:
+        rows = MergedRows(task_rows(tasks, archived=True), task_rows(archived, archived=True))
+    paginator = TaskCursorPagination()
+    page = paginator.paginate_queryset(rows, request, view=view)
+    response = paginator.get_paginated_response(tasks_data(page))
+    response["ETag"] = etag
+    return response
+
+
 class UserEmailList(APIView):
     """
-    API endpoint to retrieve a user by email.
-    - GET request with 'email' as query parameter
-    - Returns first matching user using CheckMailSerializer
+    API endpoint to look up users by email (board member picker).
+    - GET with 'email': the user with this address (case-insensitive)
+    - GET with 'prefix': typeahead, users whose email starts with the prefix
+    - POST {"emails": [...]}: batch lookup in one query, returns the found
+      users and the missing and invalid addresses
+    - See kanban_app.user_lookup
     """
     def get(self, request):
+        prefix = request.query_params.get("prefix")
+        if prefix is not None:
+            return Response(users_with_prefix(prefix))
         email = request.query_params.get("email")
         if not email:
             return Response(
                 {"detail": "Email is required."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        try:
-            validate_email(email)
-        except ValidationError:
+        result = find_users_by_email([email])
+        if result["invalid"]:
                 return Response(
                 {"detail": "Invalid email format."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        users = User.objects.filter(email=email).first()
-        if not users:
+        if not result["found"]:
             return Response(
                 {"detail": "User with this email does not exist."},
                 status=status.HTTP_404_NOT_FOUND
             )
-        serializer = CheckMailSerializer(users)
-        return Response(serializer.data)
-    
+        return Response(result["found"][0])
+
+    def post(self, request):
+        emails = request.data.get("emails") if isinstance(request.data, dict) else None
+        if not isinstance(emails, list) or not emails:
+            raise DRFValidationError({"emails": ["Expected a non-empty list of email addresses."]})
+        max_emails = lookup_config()["MAX_EMAILS"]
+        if len(emails) > max_emails:
+            raise DRFValidationError({"emails": [f"At most {max_emails} addresses per request."]})
+        return Response(find_users_by_email(emails))
+
+
 class BoardView(ListCreateAPIView):
     """
     API endpoint to list all boards with annotated metrics or create a new board.
@@ -52,8 +169,18 @@ class BoardView(ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     queryset = Boards.objects.all()
     def get_queryset(self):
-        user = self.request.user
-        return Boards.objects.filter(Q(owner=user) | Q(members=user)).distinct()
+        return user_boards(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        # Answer polling with 304 if no listed board changed (one indexed query)
+        versions = self.get_queryset().order_by("pk").values_list("pk", "version")
+        etag = make_etag("boards", request.user.pk, *versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
     
@@ -61,11 +188,19 @@ class BoardSingleView(RetrieveUpdateDestroyAPIView):
     """
     API endpoint for a single board.
     - Supports GET, PUT/PATCH, DELETE
+    - DELETE answers at once, the tasks and comments of the board are
+      purged in the background (kanban_app.purge)
     """
     queryset = Boards.objects.all()
     serializer_class = BoardDetailSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrMemberBoard]
 
+    def get_queryset(self):
+        # Only GET renders the nested board graph
+        if self.request.method != "GET":
+            return Boards.objects.all()
+        return board_detail_queryset()
+
     def get_object(self):
         """
         First, check if the board exists → 404
@@ -73,16 +208,188 @@ class BoardSingleView(RetrieveUpdateDestroyAPIView):
         """
         obj = super().get_object()
         return obj
-    
-class TaskView(mixins.ListModelMixin, mixins.CreateModelMixin, GenericAPIView):
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Answer from the cheapest source available:
+        - 304 if If-None-Match matches (only id, owner and version are read)
+        - the cached payload if it was rendered for the current version
+        - otherwise render the board and cache the payload
+        """
+        board = get_object_or_404(Boards.objects.only("id", "owner_id", "version"), pk=kwargs["pk"])
+        self.check_object_permissions(request, board)
+        etag = board_etag(board)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        data = board_response_cache.get(board)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+        else:
+            response = super().retrieve(request, *args, **kwargs)
+            board_response_cache.set(board, response.data)
+            response["X-Cache"] = "MISS"
+        response["ETag"] = etag
+        return response
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+        board_response_cache.invalidate(serializer.instance.pk)
+
+    def perform_destroy(self, instance):
+        # Tasks, comments and events are purged in the background (kanban_app.purge)
+        delete_board(instance)
+
+
+class BoardCacheStatsView(APIView):
+    """
+    API endpoint exposing the board detail cache counters of this process.
+    - Admin users only
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(board_response_cache.stats())
+
+
+class BoardChangesView(APIView):
+    """
+    API endpoint for the delta sync of a board.
+    GET /api/boards/<pk>/changes/?since=<token>
+    - Without since: all tasks and comments of the board (initial sync)
+    - With since: the tasks and comments changed since the token and the ids
+      of the ones deleted or moved away
+    - "next" is the token for the following request
+    - 400 for a malformed token, 410 if the token is older than the
+      tombstone retention and the client has to sync from scratch
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        board = get_object_or_404(Boards.objects.prefetch_related("members"), pk=pk)
+        if not is_board_member(request.user, board, request):
+            raise PermissionDenied("User must be a member of the board to sync it.")
+
+        # Taken before the queries, so nothing written meanwhile is skipped
+        now = timezone.now()
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = parse_token(since)
+            except InvalidToken:
+                raise DRFValidationError({"since": ["Invalid sync token."]})
+            if token_expired(since):
+                return Response({"detail": "Sync token expired, a full sync is required."}, status=status.HTTP_410_GONE)
+
+        tasks = tasks_data(task_rows(changed_since(DashboardTasks.objects.filter(board_id=board.pk), since)).order_by("pk"))
+        comments = comments_data(
+            comment_rows(changed_since(Comment.objects.filter(task__board_id=board.pk), since)).order_by("created_at", "pk"),
+            with_task=True,
+        )
+        deleted = deleted_ids(board.pk, since)
+        return Response({
+            "board": {
+                "id": board.pk,
+                "title": board.title,
+                "owner_id": board.owner_id,
+                "members": sorted(member.pk for member in board.members.all()),
+            },
+            "tasks": tasks,
+            "comments": comments,
+            "deleted": {
+                "tasks": sorted(deleted["tasks"] - {task["id"] for task in tasks}),
+                "comments": sorted(deleted["comments"] - {comment["id"] for comment in comments}),
+            },
+            "next": next_token(now),
+            "full": since is None,
+        })
+
+class BoardExportView(APIView):
+    """
+    API endpoint streaming a whole board, e.g. for audits.
+    GET /api/boards/<pk>/export/?format=ndjson|csv
+    - The board, then every task (by id) followed by its comments; users are
+      given by email, see kanban_app.api.export
+    - Streamed with constant memory, also for boards with millions of rows
+    - after=<task id> resumes an interrupted export behind that task
+    - include_archived=1 adds the archived tasks and their comments
+    - NDJSON by default; errors are rendered in the requested format
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer, JSONRenderer]
+
+    def get(self, request, pk):
+        board = get_object_or_404(Boards.objects.select_related("owner"), pk=pk)
+        if not is_board_member(request.user, board, request):
+            raise PermissionDenied("User must be a member of the board to export it.")
+        after = request.query_params.get("after", "0")
+        if not after.isdigit():
+            raise DRFValidationError({"after": ["Must be a task id."]})
+
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, (NDJSONRenderer, CSVRenderer)):
+            renderer = NDJSONRenderer()
+        records = board_records(board, int(after), archived=include_archived(request.query_params))
+        chunks = encoded_chunks(records, renderer)
+        if isinstance(request._request, ASGIRequest):
+            chunks = async_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=f"{renderer.media_type}; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="board-{board.pk}.{renderer.format}"'
+        return response
+
+
+class BoardImportView(APIView):
+    """
+    API endpoint importing boards, tasks and comments from NDJSON.
+    POST /api/import/[?board=<pk>] with one record per line (the format of
+    the board export), see kanban_app.importer
+    - The body is read as a stream and written in batches
+    - The user owns the imported boards, board=<pk> takes tasks before the
+      first board record (membership required)
+    - Invalid lines are skipped; the response reports the created objects
+      and the errors and warnings by line number
+    - Large migrations: python manage.py import_ndjson
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        board = None
+        board_id = request.query_params.get("board")
+        if board_id is not None:
+            if not board_id.isdigit():
+                raise DRFValidationError({"board": ["Must be a board id."]})
+            board = get_object_or_404(Boards, pk=board_id)
+            if not is_board_member(request.user, board, request):
+                raise PermissionDenied("User must be a member of the board to import into it.")
+        report = Importer(request.user, board=board).run(request.stream or ())
+        return Response(report.as_dict())
+
+
+class TaskView(mixins.CreateModelMixin, GenericAPIView):
     """
     API endpoint to list all tasks or create a new task.
-    GET: Returns all tasks
+    GET: Returns the tasks of all boards the user owns or is a member of (cursor paginated)
     POST: Creates a new task
     """
     queryset = DashboardTasks.objects.all()
     serializer_class = TasksSerializer
     permission_classes = [IsBoardMemberForTask]
+    pagination_class = TaskCursorPagination
+
+    def get_queryset(self):
+        if self.request.method != "GET":
+            return DashboardTasks.objects.all()
+        user = self.request.user
+        member_boards = Boards.members.through.objects.filter(user=user).values("boards_id")
+        tasks = DashboardTasks.objects.filter(Q(board__owner=user) | Q(board__in=member_boards))
+        # The join does not apply the Boards manager, leave out deleted boards
+        return task_rows(tasks.filter(board__deleted_at__isnull=True))
+
+    def get(self, request, *args, **kwargs):
+        # Flat rows and row mappers instead of TasksSerializer (kanban_app.api.projections)
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(tasks_data(page))
 
     def post(self, request, *args, **kwargs):
         board_id = request.data.get("board")
@@ -92,69 +399,192 @@ class TaskView(mixins.ListModelMixin, mixins.CreateModelMixin, GenericAPIView):
             board = Boards.objects.get(pk=board_id)
         except Boards.DoesNotExist:
             raise NotFound("Board does not exist.")
-        user = request.user
-        if board.owner != user and user not in board.members.all():
+        if not is_board_member(request.user, board, request):
             raise PermissionDenied("User must be a member of the board to perform this action.")
 
         # Serialize the data and save the new task
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(board=board)  
+        with transaction.atomic():
+            serializer.save(board=board)
+        board_response_cache.invalidate(board.pk)
         return Response(serializer.data, status=201)
 
 
+class TaskBulkView(APIView):
+    """
+    API endpoint to create or move many tasks in one request.
+    POST: list of tasks (same fields as POST /api/tasks/)
+    PATCH: list of {id, status, priority, assignee_id, reviewer_id}
+    - Boards, users and tasks are resolved with one query each
+    - One membership check per board
+    - Written with bulk_create/bulk_update in a single transaction
+    """
+    permission_classes = [IsAuthenticated]
+    max_items = getattr(settings, "KANBAN_BULK_MAX_ITEMS", 500)
+
+    def validate_items(self, serializer_class, data):
+        if not isinstance(data, list) or not data:
+            raise DRFValidationError({"detail": "Expected a non-empty list."})
+        if len(data) > self.max_items:
+            raise DRFValidationError({"detail": f"At most {self.max_items} tasks per request."})
+        serializer = serializer_class(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def check_boards(self, request, board_ids):
+        for board_id in board_ids:
+            if not board_id or not is_board_member(request.user, board_id, request):
+                raise PermissionDenied("User must be a member of the board to perform this action.")
+
+    def resolve_users(self, items):
+        """
+        Load all referenced users with one IN query.
+        - Raises a ValidationError aligned with the items for unknown ids
+        """
+        user_ids = {item[field] for item in items for field in ("assignee_id", "reviewer_id") if field in item}
+        users = User.objects.in_bulk(user_ids)
+        errors = [
+            {field: [f'Invalid pk "{item[field]}" - object does not exist.']
+             for field in ("assignee_id", "reviewer_id") if field in item and item[field] not in users}
+            for item in items
+        ]
+        if any(errors):
+            raise DRFValidationError(errors)
+        return users
+
+    def respond(self, task_ids, status_code):
+        tasks = task_rows(DashboardTasks.objects.filter(pk__in=task_ids)).order_by("pk")
+        return Response(tasks_data(tasks), status=status_code)
+
+    def post(self, request):
+        items = self.validate_items(BulkTaskCreateSerializer, request.data)
+        board_ids = {item["board"] for item in items}
+        boards = Boards.objects.in_bulk(board_ids)
+        if len(boards) != len(board_ids):
+            raise NotFound("Board does not exist.")
+        self.check_boards(request, board_ids)
+        users = self.resolve_users(items)
+
+        tasks = [
+            DashboardTasks(
+                **{
+                    **item,
+                    "board": boards[item["board"]],
+                    "assignee_id": users[item["assignee_id"]],
+                    "reviewer_id": users[item["reviewer_id"]],
+                }
+            )
+            for item in items
+        ]
+        with transaction.atomic():
+            tasks = DashboardTasks.objects.bulk_create(tasks)
+            tasks_created_in_bulk(tasks)
+        return self.respond([task.pk for task in tasks], status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        items = self.validate_items(BulkTaskUpdateSerializer, request.data)
+        tasks = DashboardTasks.objects.in_bulk({item["id"] for item in items})
+        if len(tasks) != len({item["id"] for item in items}):
+            raise NotFound("Task does not exist.")
+        self.check_boards(request, {task.board_id for task in tasks.values()})
+        users = self.resolve_users(items)
+
+        changed_fields = set()
+        for item in items:
+            task = tasks[item["id"]]
+            for field, value in item.items():
+                if field == "id":
+                    continue
+                setattr(task, field, users[value] if field in ("assignee_id", "reviewer_id") else value)
+                changed_fields.add(field)
+        if changed_fields:
+            # bulk_update does not apply auto_now
+            now = timezone.now()
+            for task in tasks.values():
+                task.updated_at = now
+            changed_fields.add("updated_at")
+        with transaction.atomic():
+            if changed_fields:
+                DashboardTasks.objects.bulk_update(tasks.values(), sorted(changed_fields))
+            tasks_changed_in_bulk(task.board_id for task in tasks.values())
+        return self.respond(list(tasks), status.HTTP_200_OK)
+
+
 class TasksSingleView(RetrieveUpdateDestroyAPIView):
     """
     API endpoint for a single task.
     - Supports GET, PUT/PATCH, DELETE
+    - GET with ?include_archived=1 also finds archived tasks (read only,
+      marked with "archived": true)
     """
     queryset = DashboardTasks.objects.all()
     permission_classes = [IsBoardMemberForTask]
     serializer_class = TaskDetailSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        if not include_archived(request.query_params) or DashboardTasks.objects.filter(pk=kwargs["pk"]).exists():
+            return super().retrieve(request, *args, **kwargs)
+        task = get_object_or_404(ArchivedTask.objects.select_related("assignee_id", "reviewer_id"), pk=kwargs["pk"])
+        self.check_object_permissions(request, task)
+        return Response({**self.get_serializer(task).data, "archived": True})
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_board_id = serializer.instance.board_id
+        serializer.save()
+        board_response_cache.invalidate(old_board_id, serializer.instance.board_id)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        board_response_cache.invalidate(instance.board_id)
+        instance.delete()
+
 
 class AssignedTaskView(APIView):
     """
     API endpoint to get all tasks assigned to the requesting user.
-    - GET request
+    - GET request, cursor paginated
+    - ?include_archived=1 lists archived tasks too
     """
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        tasks = DashboardTasks.objects.filter(assignee_id=request.user)
-        serializer = TasksSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return user_task_list(self, request, assignee_id=request.user)
     
 class ReviewerTaskView(APIView):
     """
     API endpoint to get all tasks where the requesting user is the reviewer.
-    - GET request
+    - GET request, cursor paginated
+    - ?include_archived=1 lists archived tasks too
     """
     permission_classes = [IsBoardMemberForTask]
     def get(self, request):
-        tasks = DashboardTasks.objects.filter(reviewer_id=request.user)
-        serializer = TasksSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return user_task_list(self, request, reviewer_id=request.user)
 
 class TaskCommentsView(APIView):
     """
     API endpoint to list or create comments for a specific task.
     GET:
-    - Returns all comments for the task
+    - Returns the comments for the task, oldest first (cursor paginated)
+    - ?include_archived=1 also finds archived tasks
     """
     permission_classes = [IsAuthenticated, IsCommentAuthorOrBoardMember]
     def get(self, request, task_pk):
-        task = get_object_or_404(DashboardTasks, pk=task_pk)
-        if not task.board:
+        task = DashboardTasks.objects.filter(pk=task_pk).first()
+        if task is None and include_archived(request.query_params):
+            task = ArchivedTask.objects.filter(pk=task_pk).first()
+        if task is None:
+            raise NotFound("No DashboardTasks matches the given query.")
+        if not task.board_id:
             raise PermissionDenied("Task is not assigned to a board.")
 
-        user = request.user
-        board = task.board
-        if user != board.owner and user not in board.members.all():
+        if not is_board_member(request.user, task.board_id, request):
             raise PermissionDenied("User must be a member of the board to view comments.")
 
-        comments = Comment.objects.filter(task=task)
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        comments = comment_rows(task.comments.all())
+        paginator = CommentCursorPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        return paginator.get_paginated_response(comments_data(page))
 
     """
     POST:
@@ -169,20 +599,21 @@ class TaskCommentsView(APIView):
         task = get_object_or_404(DashboardTasks, pk=task_pk)
 
         # Check if task has a board
-        if not task.board:
+        if not task.board_id:
             raise PermissionDenied("Task is not assigned to a board.")
 
-        board = task.board
         user = request.user
 
         # Only Board owner or member can post
-        if user != board.owner and user not in board.members.all():
+        if not is_board_member(user, task.board_id, request):
             raise PermissionDenied("User must be a member of the board to comment.")
 
         # Create the comment
         serializer = CommentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(task=task, author=user)
+        with transaction.atomic():
+            serializer.save(task=task, author=user)
+        board_response_cache.invalidate(task.board_id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
 class CommentSingleView(generics.RetrieveUpdateDestroyAPIView):
@@ -197,4 +628,48 @@ class CommentSingleView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         # Filter comments for the specific task and the individual comment
         task_pk = self.kwargs['task_pk']
-        return Comment.objects.filter(task_id=task_pk)
\ No newline at end of file
+        return Comment.objects.filter(task_id=task_pk)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # Editing a comment does not change the board payload, deleting changes the count
+        if instance.task_id:
+            board_response_cache.invalidate(instance.task.board_id)
+        instance.delete()
+
+class SearchView(APIView):
+    """
+    API endpoint for the full-text search over tasks and comments.
+    GET /api/search/?q=<terms>
+    - Searches task titles, descriptions and comments of the boards the user
+      owns or is a member of, every term has to match
+    - Best hits first (see kanban_app.search), keyset paginated: "next" is
+      the URL of the following page
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        terms = search_terms(request.query_params.get("q", ""))
+        if not terms:
+            raise DRFValidationError({"q": ["Enter at least one search term."]})
+        cursor = request.query_params.get("cursor")
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except InvalidCursor:
+            raise NotFound("Invalid cursor")
+        paginator = KeysetPagination()
+        page_size = paginator.get_page_size(request)
+
+        board_ids = list(user_boards(request.user).values_list("pk", flat=True))
+        hits = search_backend().search(terms, board_ids, page_size + 1, after)
+        next_url = None
+        if len(hits) > page_size:
+            hits = hits[:page_size]
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", encode_cursor(hits[-1]["key"]))
+        for hit in hits:
+            del hit["key"]
+        return Response({"next": next_url, "results": hits})
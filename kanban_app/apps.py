@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class KanbanAppConfig(AppConfig):
     name = 'kanban_app'
+
+    def ready(self):
+        # Register signal handlers (membership cache invalidation)
+        from . import signals  # noqa: F401
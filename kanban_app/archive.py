@@ -0,0 +1,100 @@
+"""
+Hot/cold archiving of finished tasks.
+
+Tasks with status "done" and no change (including comments, which touch the
+task's updated_at) for AFTER_DAYS are moved from DashboardTasks and Comment
+into ArchivedTask and ArchivedComment, keeping their ids. Board lists, board
+metrics and the per-user task lists then only touch live work.
+
+The archive_tasks command moves them in batches of BATCH_SIZE tasks, one
+transaction per batch, in id order. Every batch is complete on its own, so
+an interrupted run is resumed by running the command again (--after skips
+the ids already scanned).
+
+Reads reach archived tasks with ?include_archived=1 on the assigned and
+reviewing lists, the task detail, the task comments and the board export.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from kanban_app.models import ArchivedComment, ArchivedTask, Comment, DashboardTasks
+from kanban_app.signals import tasks_archived
+
+INCLUDE_ARCHIVED_PARAM = "include_archived"
+
+
+def archive_config():
+    config = {
+        "AFTER_DAYS": 90,
+        "BATCH_SIZE": 500,
+    }
+    config.update(getattr(settings, "KANBAN_ARCHIVE", {}))
+    return config
+
+
+def include_archived(query_params):
+    """
+    True if a request asks for archived tasks too (?include_archived=1).
+    """
+    return query_params.get(INCLUDE_ARCHIVED_PARAM, "").lower() in ("1", "true", "yes")
+
+
+def archive_cutoff(days=None):
+    days = archive_config()["AFTER_DAYS"] if days is None else days
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable_tasks(cutoff, after=0):
+    return DashboardTasks.objects.filter(status="done", updated_at__lt=cutoff, pk__gt=after).order_by("pk")
+
+
+def copy_fields(instance, model, **extra):
+    # The archive models share the field names of the live ones
+    values = {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+    return model(**values, **extra)
+
+
+def archive_batch(cutoff, after=0, batch_size=None):
+    """
+    Move the next batch of archivable tasks behind id after, with their comments.
+    - One transaction; the tasks are locked (select_for_update) so a change
+      in between cannot be lost
+    - Returns {"last_id", "tasks", "comments"}, None when nothing is left
+    """
+    batch_size = batch_size or archive_config()["BATCH_SIZE"]
+    with transaction.atomic():
+        tasks = list(archivable_tasks(cutoff, after).select_for_update()[:batch_size])
+        if not tasks:
+            return None
+        task_ids = [task.pk for task in tasks]
+        comments = list(Comment.objects.filter(task_id__in=task_ids).select_for_update())
+        archived = ArchivedTask.objects.bulk_create([copy_fields(task, ArchivedTask) for task in tasks])
+        ArchivedComment.objects.bulk_create([copy_fields(comment, ArchivedComment) for comment in comments])
+        # Raw deletes send no per-row signals, tasks_archived applies their
+        # side effects once per batch; the comments go first (foreign key)
+        comment_ids = [comment.pk for comment in comments]
+        Comment.objects.filter(pk__in=comment_ids)._raw_delete(Comment.objects.db)
+        DashboardTasks.objects.filter(pk__in=task_ids)._raw_delete(DashboardTasks.objects.db)
+        tasks_archived(archived, comment_ids)
+    return {"last_id": task_ids[-1], "tasks": len(tasks), "comments": len(comments)}
+
+
+def archive_tasks(days=None, after=0, batch_size=None, max_batches=None):
+    """
+    Archive all archivable tasks batch by batch.
+    - Yields the result of every batch with its duration in ms ("ms")
+    """
+    cutoff = archive_cutoff(days)
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        start = time.perf_counter()
+        result = archive_batch(cutoff, after, batch_size)
+        if result is None:
+            return
+        result["ms"] = (time.perf_counter() - start) * 1000
+        batches += 1
+        after = result["last_id"]
+        yield result
@@ -0,0 +1,142 @@
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from kanban_app.models import BoardEvent
+
+
+class EventBroker:
+    """
+    In-process fan-out of "new events" notifications to open feed connections.
+    - A subscriber is a bounded asyncio queue bound to its event loop, so an
+      idle connection is a suspended coroutine, not a thread
+    - A full queue drops the notification: the subscriber reads everything
+      after its cursor from the database on the next wake-up anyway
+    - Other processes are not notified; their subscribers catch up on the
+      next heartbeat (KANBAN_EVENTS["HEARTBEAT"])
+    """
+
+    def __init__(self, buffer_size, max_subscribers):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.dropped = 0
+        self._subscribers = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, board_id, loop, queue_factory):
+        """
+        Register a queue for the board, returns None if the process is full.
+        """
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                return None
+            queue = queue_factory(maxsize=self.buffer_size)
+            self._subscribers.setdefault(board_id, set()).add((loop, queue))
+            self._count += 1
+            return queue
+
+    def unsubscribe(self, board_id, loop, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(board_id)
+            if subscribers is None or (loop, queue) not in subscribers:
+                return
+            subscribers.discard((loop, queue))
+            self._count -= 1
+            if not subscribers:
+                del self._subscribers[board_id]
+
+    def publish(self, board_id, event_id):
+        with self._lock:
+            subscribers = list(self._subscribers.get(board_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event_id)
+            except RuntimeError:
+                # The loop of a closed connection
+                pass
+
+    def _offer(self, queue, event_id):
+        if queue.full():
+            self.dropped += 1
+        else:
+            queue.put_nowait(event_id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "subscribers": self._count,
+                "boards": len(self._subscribers),
+                "dropped": self.dropped,
+            }
+
+
+def events_config():
+    config = {
+        "BUFFER_SIZE": 16,
+        "MAX_SUBSCRIBERS": 10000,
+        "HEARTBEAT": 15,
+        "LONG_POLL_TIMEOUT": 25,
+        "BATCH_SIZE": 100,
+    }
+    config.update(getattr(settings, "KANBAN_EVENTS", {}))
+    return config
+
+
+_config = events_config()
+event_broker = EventBroker(
+    buffer_size=_config["BUFFER_SIZE"],
+    max_subscribers=_config["MAX_SUBSCRIBERS"],
+)
+
+
+def _publish_on_commit(events):
+    latest = {}
+    for event in events:
+        latest[event.board_id] = max(latest.get(event.board_id, 0), event.pk or 0)
+
+    def publish():
+        for board_id, event_id in latest.items():
+            event_broker.publish(board_id, event_id)
+
+    # Subscribers must only look for the events once they are visible
+    transaction.on_commit(publish)
+
+
+def record_event(board_id, kind, payload=None):
+    """
+    Append one event to the log of a board.
+    - Runs in the caller's transaction, subscribers are woken after the commit
+    """
+    if not board_id:
+        return None
+    event = BoardEvent.objects.create(board_id=board_id, kind=kind, payload=payload or {})
+    _publish_on_commit([event])
+    return event
+
+
+def record_events(board_ids, kind, payload=None):
+    """
+    Append the same event to the logs of several boards with one INSERT.
+    """
+    events = [
+        BoardEvent(board_id=board_id, kind=kind, payload=payload or {})
+        for board_id in sorted({board_id for board_id in board_ids if board_id})
+    ]
+    if events:
+        events = BoardEvent.objects.bulk_create(events)
+        _publish_on_commit(events)
+    return events
+
+
+def events_after(board_id, cursor, limit):
+    """
+    Return up to limit events of the board with an id greater than cursor.
+    """
+    return BoardEvent.objects.filter(board_id=board_id, id__gt=cursor).order_by("id").values(
+        "id", "kind", "payload", "created_at"
+    )[:limit]
+
+
+def latest_event_id(board_id):
+    return BoardEvent.objects.filter(board_id=board_id).order_by("-id").values_list("id", flat=True)
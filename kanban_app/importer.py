@@ -0,0 +1,308 @@
+"""
+Bulk import of boards, tasks and comments from NDJSON.
+
+The input has the records of the board export (kanban_app.api.export), one
+JSON object per line:
+- {"record": "board", "title", "owner", "members": [emails]}
+- {"record": "task", "id", "title", "description", "status", "priority",
+  "due_date", "assignee", "reviewer"}, added to the last board above it
+- {"record": "comment", "task", "author", "content"}, "task" is the "id" of
+  a task record of the input
+Users are referenced by email and have to exist. Ids and timestamps of the
+input are not kept.
+
+Lines are read as a stream and written in batches of BATCH_SIZE lines, one
+transaction and one bulk_create per model each. Invalid lines are reported
+with their line number and skipped, the rest of the input is imported.
+Comments can refer to the last TASK_REFS tasks of the input, so memory
+stays flat for any input size.
+"""
+import json
+from collections import OrderedDict
+from datetime import date
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from kanban_app.models import Boards, Comment, DashboardTasks
+from kanban_app.signals import comments_created_in_bulk, tasks_created_in_bulk
+from kanban_app.user_lookup import user_rows
+
+STATUSES = {value for value, label in DashboardTasks.STATUS_CHOICES}
+PRIORITIES = {value for value, label in DashboardTasks.PRIORITY_CHOICES}
+
+
+def import_config():
+    config = {
+        "BATCH_SIZE": 2000,
+        "TASK_REFS": 100_000,
+        "MAX_ISSUES": 100,
+    }
+    config.update(getattr(settings, "KANBAN_IMPORT", {}))
+    return config
+
+
+class InvalidRecord(ValueError):
+    pass
+
+
+class ImportReport:
+    """
+    Counters and the first MAX_ISSUES errors and warnings of an import.
+    - Errors are skipped lines, warnings lines imported without a value
+      (e.g. an unknown assignee)
+    """
+
+    def __init__(self, max_issues):
+        self.max_issues = max_issues
+        self.lines = 0
+        self.created = {"boards": 0, "members": 0, "tasks": 0, "comments": 0}
+        self.error_count = 0
+        self.warning_count = 0
+        self.errors = []
+        self.warnings = []
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_issues:
+            self.errors.append({"line": line, "error": message})
+
+    def warning(self, line, message):
+        self.warning_count += 1
+        if len(self.warnings) < self.max_issues:
+            self.warnings.append({"line": line, "warning": message})
+
+    def as_dict(self):
+        return {
+            "lines": self.lines,
+            "created": dict(self.created),
+            "error_count": self.error_count,
+            "errors": list(self.errors),
+            "warning_count": self.warning_count,
+            "warnings": list(self.warnings),
+        }
+
+
+def text(record, field, max_length, required=True):
+    value = record.get(field, "")
+    if value is None:
+        value = ""
+    if not isinstance(value, str):
+        raise InvalidRecord(f'"{field}" must be a string.')
+    if required and not value.strip():
+        raise InvalidRecord(f'"{field}" is required.')
+    if max_length and len(value) > max_length:
+        raise InvalidRecord(f'"{field}" has more than {max_length} characters.')
+    return value
+
+
+def choice(record, field, choices, default):
+    value = record.get(field) or default
+    if value not in choices:
+        raise InvalidRecord(f'"{field}" must be one of {", ".join(sorted(choices))}.')
+    return value
+
+
+def due_date(record):
+    value = record.get("due_date")
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        raise InvalidRecord('"due_date" must be an ISO date.')
+
+
+class Importer:
+    """
+    Import NDJSON lines, see the module docstring.
+    - user: the importing user; owns the imported boards unless keep_owners
+      is set, the "owner" of the input then only becomes a member
+    - board: existing board for task records before the first board record
+    - progress: called with the ImportReport after every batch
+    """
+
+    def __init__(self, user, board=None, keep_owners=False, batch_size=None, progress=None):
+        config = import_config()
+        self.user = user
+        self.keep_owners = keep_owners
+        self.batch_size = batch_size or config["BATCH_SIZE"]
+        self.task_refs_size = config["TASK_REFS"]
+        self.progress = progress
+        self.report = ImportReport(config["MAX_ISSUES"])
+        # Board of the following task records: a board, None, or False after a failed board record
+        self.board = board
+        self.task_refs = OrderedDict()
+        self.users = {}
+
+    def run(self, lines):
+        """
+        Import an iterable of lines (str or bytes), returns the ImportReport.
+        """
+        batch = []
+        for number, line in enumerate(lines, start=1):
+            self.report.lines = number
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.report.error(number, "Invalid JSON.")
+                continue
+            if not isinstance(record, dict) or record.get("record") not in ("board", "task", "comment"):
+                self.report.error(number, 'Expected an object with "record": "board", "task" or "comment".')
+                continue
+            batch.append((number, record))
+            if len(batch) >= self.batch_size:
+                self.write_batch(batch)
+                batch = []
+        if batch:
+            self.write_batch(batch)
+        return self.report
+
+    def resolve_users(self, batch):
+        """
+        Load the ids of the emails of a batch not seen before, in one query.
+        - Case-insensitive, the oldest user wins (see kanban_app.user_lookup)
+        """
+        emails = set()
+        for number, record in batch:
+            for field in ("owner", "assignee", "reviewer", "author"):
+                if isinstance(record.get(field), str):
+                    emails.add(record[field].strip().lower())
+            if isinstance(record.get("members"), list):
+                emails.update(email.strip().lower() for email in record["members"] if isinstance(email, str))
+        emails = {email for email in emails if email not in self.users}
+        if not emails:
+            return
+        found = {}
+        for row in user_rows().filter(email_lower__in=list(emails)).order_by("-pk"):
+            found[row["email_lower"]] = row["id"]
+        for email in emails:
+            self.users[email] = found.get(email)
+
+    def user_id(self, number, record, field, required=False):
+        email = record.get(field)
+        if not email:
+            if required:
+                raise InvalidRecord(f'"{field}" is required.')
+            return None
+        if not isinstance(email, str):
+            raise InvalidRecord(f'"{field}" must be an email.')
+        user_id = self.users.get(email.strip().lower())
+        if user_id is None:
+            if required:
+                raise InvalidRecord(f'Unknown {field} "{email}".')
+            self.report.warning(number, f'Unknown {field} "{email}", not set.')
+        return user_id
+
+    def create_board(self, number, record, created):
+        title = text(record, "title", Boards._meta.get_field("title").max_length)
+        owner_id = self.user_id(number, record, "owner")
+        if not self.keep_owners or owner_id is None:
+            owner_id, member_ids = self.user.pk, {owner_id}
+        else:
+            member_ids = set()
+        members = record.get("members") or []
+        if not isinstance(members, list):
+            raise InvalidRecord('"members" must be a list of emails.')
+        for email in members:
+            member_ids.add(self.user_id(number, {"member": email}, "member"))
+        member_ids -= {None, owner_id}
+        board = Boards.objects.create(title=title, owner_id=owner_id)
+        if member_ids:
+            board.members.add(*member_ids)
+        created["boards"] += 1
+        created["members"] += len(member_ids)
+        return board
+
+    def build_task(self, number, record):
+        if self.board is None:
+            raise InvalidRecord("Task before the first board record.")
+        if self.board is False:
+            raise InvalidRecord("The board of this task was not imported.")
+        return DashboardTasks(
+            board=self.board,
+            title=text(record, "title", DashboardTasks._meta.get_field("title").max_length),
+            description=text(record, "description", None, required=False),
+            status=choice(record, "status", STATUSES, "to-do"),
+            priority=choice(record, "priority", PRIORITIES, "medium"),
+            due_date=due_date(record),
+            assignee_id_id=self.user_id(number, record, "assignee"),
+            reviewer_id_id=self.user_id(number, record, "reviewer"),
+        )
+
+    def build_comment(self, record, batch_tasks):
+        task = batch_tasks.get(record.get("task")) or self.task_refs.get(record.get("task"))
+        if task is None:
+            raise InvalidRecord(f'Unknown task "{record.get("task")}", tasks have to come before their comments.')
+        comment = Comment(
+            content=text(record, "content", Comment._meta.get_field("content").max_length),
+            author_id=self.user_id(None, record, "author", required=True),
+        )
+        return comment, task
+
+    def write_batch(self, batch):
+        """
+        Write one batch in its own transaction.
+        - A database error skips the whole batch, reported as one error
+        """
+        self.resolve_users(batch)
+        board = self.board
+        created = dict.fromkeys(self.report.created, 0)
+        # Task references of this batch: source id -> DashboardTasks, or
+        # (task id, board id) for tasks of earlier batches
+        batch_tasks = {}
+        try:
+            with transaction.atomic():
+                tasks, comments = [], []
+                for number, record in batch:
+                    try:
+                        kind = record["record"]
+                        if kind == "board":
+                            # Stays False if the record is rejected, its tasks are skipped
+                            self.board = False
+                            self.board = self.create_board(number, record, created)
+                        elif kind == "task":
+                            task = self.build_task(number, record)
+                            tasks.append(task)
+                            if record.get("id") is not None:
+                                batch_tasks[record["id"]] = task
+                        else:
+                            comments.append(self.build_comment(record, batch_tasks))
+                    except InvalidRecord as error:
+                        self.report.error(number, str(error))
+                    except (TypeError, AttributeError):
+                        self.report.error(number, "Invalid record.")
+                if tasks:
+                    DashboardTasks.objects.bulk_create(tasks)
+                    tasks_created_in_bulk(tasks)
+                if comments:
+                    pairs = []
+                    for comment, task in comments:
+                        if isinstance(task, DashboardTasks):
+                            comment.task_id, board_id = task.pk, task.board_id
+                        else:
+                            comment.task_id, board_id = task
+                        pairs.append((comment, board_id))
+                    Comment.objects.bulk_create([comment for comment, board_id in pairs])
+                    comments_created_in_bulk(pairs)
+        except DatabaseError as error:
+            self.report.error(batch[0][0], f"Lines {batch[0][0]}-{batch[-1][0]} not imported: {error}")
+            # Tasks of a board created in the failed batch are skipped as well
+            self.board = board if not any(record["record"] == "board" for number, record in batch) else False
+        else:
+            created["tasks"], created["comments"] = len(tasks), len(comments)
+            for field, count in created.items():
+                self.report.created[field] += count
+            for source_id, task in batch_tasks.items():
+                self.remember_task(source_id, (task.pk, task.board_id))
+        if self.progress:
+            self.progress(self.report)
+
+    def remember_task(self, source_id, reference):
+        self.task_refs[source_id] = reference
+        self.task_refs.move_to_end(source_id)
+        while len(self.task_refs) > self.task_refs_size:
+            self.task_refs.popitem(last=False)
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from kanban_app.archive import archivable_tasks, archive_config, archive_cutoff, archive_tasks
+
+
+class Command(BaseCommand):
+    """
+    Move done tasks unchanged for --days, with their comments, to the archive.
+    - One transaction per batch, prints rows moved and time per batch
+    - Safe to interrupt: run it again, or pass --after with the last
+      reported id to skip the part already scanned
+    - --dry-run only counts the archivable tasks
+    """
+    help = "Archive old done tasks and their comments in batches."
+
+    def add_arguments(self, parser):
+        config = archive_config()
+        parser.add_argument("--days", type=int, default=config["AFTER_DAYS"], help="Minimum age since the last change.")
+        parser.add_argument("--batch-size", type=int, default=config["BATCH_SIZE"])
+        parser.add_argument("--after", type=int, default=0, help="Resume behind this task id.")
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = archivable_tasks(archive_cutoff(options["days"]), options["after"]).count()
+            self.stdout.write(f"{count} tasks can be archived.")
+            return
+
+        start = time.perf_counter()
+        totals = {"batches": 0, "tasks": 0, "comments": 0}
+        for result in archive_tasks(
+            days=options["days"], after=options["after"],
+            batch_size=options["batch_size"], max_batches=options["max_batches"],
+        ):
+            totals["batches"] += 1
+            totals["tasks"] += result["tasks"]
+            totals["comments"] += result["comments"]
+            self.stdout.write(
+                f"  batch {totals['batches']}: {result['tasks']} tasks, {result['comments']} comments,"
+                f" last id {result['last_id']}, {result['ms']:.0f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {totals['tasks']} tasks and {totals['comments']} comments in {totals['batches']} batches"
+            f" ({time.perf_counter() - start:.1f}s)."
+        ))
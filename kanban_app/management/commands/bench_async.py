@@ -0,0 +1,88 @@
+import asyncio
+import time
+import types
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import include, path
+from rest_framework.authtoken.models import Token
+from kanban_app.api.response_cache import board_response_cache
+from kanban_app.api.urls import build_urlpatterns
+from kanban_app.models import Boards, DashboardTasks
+
+
+def urlconf(use_async):
+    module = types.ModuleType("async_urls" if use_async else "sync_urls")
+    module.urlpatterns = [
+        path("api/", include("auth_app.api.urls")),
+        path("api/", include(build_urlpatterns(use_async))),
+    ]
+    return module
+
+
+class Command(BaseCommand):
+    """
+    Compare the sync and async read stacks through the ASGI handler.
+    - Sends the same GET with 10, 100 and 1,000 concurrent clients
+    - The board detail cache is disabled for the run (see --cached)
+    - Creates a temporary board and user and deletes them afterwards
+    """
+    help = "Benchmark requests/second of the sync and async read endpoints under ASGI."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--levels", default="10,100,1000", help="Comma separated concurrency levels.")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per level.")
+        parser.add_argument("--tasks", type=int, default=50, help="Tasks on the benchmark board.")
+        parser.add_argument("--endpoint", choices=["board", "boards", "assigned"], default="board")
+        parser.add_argument("--cached", action="store_true", help="Keep the board detail cache enabled.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        user = User.objects.create_user("bench.async", "bench.async@example.com")
+        try:
+            token = Token.objects.create(user=user)
+            board = Boards.objects.create(title="Async benchmark", owner=user)
+            board.members.add(user)
+            DashboardTasks.objects.bulk_create(
+                DashboardTasks(title=f"Task {number}", description="", board=board, assignee_id=user, reviewer_id=user)
+                for number in range(options["tasks"])
+            )
+            url = {
+                "board": f"/api/boards/{board.pk}/",
+                "boards": "/api/boards/",
+                "assigned": "/api/tasks/assigned-to-me/",
+            }[options["endpoint"]]
+            levels = [int(level) for level in options["levels"].split(",")]
+
+            self.stdout.write(f"{'clients':>8} {'sync req/s':>12} {'async req/s':>12}")
+            for level in levels:
+                results = []
+                for use_async in (False, True):
+                    with override_settings(ROOT_URLCONF=urlconf(use_async)):
+                        results.append(asyncio.run(
+                            self.load(url, token.key, level, options["requests"], options["cached"])
+                        ))
+                self.stdout.write(f"{level:>8} {results[0]:>12.1f} {results[1]:>12.1f}")
+        finally:
+            Boards.objects.filter(owner=user).delete()
+            user.delete()
+            teardown_test_environment()
+
+    async def load(self, url, key, concurrency, total, cached):
+        client = AsyncClient()
+        headers = {"Authorization": f"Token {key}"}
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                if not cached:
+                    board_response_cache.cache.clear()
+                response = await client.get(url, headers=headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} returned {response.status_code}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
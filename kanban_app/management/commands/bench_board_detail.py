@@ -0,0 +1,77 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from kanban_app.api.response_cache import board_response_cache
+from kanban_app.models import Boards, DashboardTasks, Comment
+from kanban_app.signals import comments_created_in_bulk, tasks_created_in_bulk
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark data at the end of the run."""
+
+
+class Command(BaseCommand):
+    """
+    Measure GET /api/boards/<pk>/ for growing board sizes.
+    - Creates a temporary board with N tasks (and one comment per task),
+      with the statistics and versions updated as by the bulk endpoints
+    - The board detail cache is cleared before every request (see --cached)
+    - Prints median latency and query count per size
+    - All data is rolled back afterwards
+    """
+    help = "Benchmark the board detail endpoint from 10 to 10,000 tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,100,1000,10000", help="Comma separated task counts.")
+        parser.add_argument("--repeat", type=int, default=5, help="Requests per size.")
+        parser.add_argument("--cached", action="store_true", help="Keep the board detail cache enabled.")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        try:
+            with transaction.atomic():
+                self.run(sizes, options["repeat"], options["cached"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, sizes, repeat, cached):
+        owner = User.objects.create_user("bench.owner", "bench.owner@example.com")
+        reviewer = User.objects.create_user("bench.reviewer", "bench.reviewer@example.com")
+        board = Boards.objects.create(title="Benchmark", owner=owner)
+        board.members.add(owner, reviewer)
+        client = APIClient(SERVER_NAME="localhost")
+        client.force_authenticate(owner)
+
+        self.stdout.write(f"{'tasks':>8} {'median ms':>10} {'queries':>8}")
+        created = 0
+        for size in sizes:
+            tasks = DashboardTasks.objects.bulk_create(
+                DashboardTasks(
+                    title=f"Task {number}", description="", board=board,
+                    assignee_id=owner, reviewer_id=reviewer,
+                )
+                for number in range(created, size)
+            )
+            tasks_created_in_bulk(tasks)
+            comments = Comment.objects.bulk_create(Comment(task=task, content="bench", author=owner) for task in tasks)
+            comments_created_in_bulk([(comment, board.pk) for comment in comments])
+            created = max(created, size)
+
+            timings = []
+            for _ in range(repeat):
+                if not cached:
+                    board_response_cache.cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = client.get(f"/api/boards/{board.pk}/")
+                    timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    self.stderr.write(f"Unexpected status {response.status_code}")
+                    return
+            self.stdout.write(f"{size:>8} {statistics.median(timings):>10.1f} {len(queries):>8}")
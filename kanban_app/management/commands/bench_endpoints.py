@@ -0,0 +1,334 @@
+import itertools
+import json
+import math
+import platform
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.api import urls as auth_urls
+from kanban_app.api import urls as kanban_urls
+from kanban_app.models import Boards, Comment, DashboardTasks
+from kanban_app.seeding import seed
+from kanban_app.sync import make_token
+
+PASSWORD = "bench-password"
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark data at the end of the run."""
+
+
+class Scenario:
+    """
+    One request of the benchmark.
+    - route: URL name the request belongs to (coverage check)
+    - path/data: values or callables taking the fixture and the prepared value
+    - prepare: untimed callable run before every request (e.g. create the
+      object a DELETE removes), its result is passed to path/data
+    - content_type: send data as raw body of this type instead of JSON
+    """
+
+    def __init__(self, route, method, path, data=None, prepare=None, status=200, client="member", content_type=None):
+        self.route = route
+        self.method = method
+        self.path = path
+        self.data = data
+        self.prepare = prepare
+        self.status = status
+        self.client = client
+        self.content_type = content_type
+
+    @property
+    def key(self):
+        return f"{self.method} {self.route}"
+
+    def resolve(self, value, fixture, prepared):
+        return value(fixture, prepared) if callable(value) else value
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class Fixture:
+    """
+    Objects the scenarios run against.
+    - The member owns the largest board of the database (seeded data), or
+      of a small generated data set if the database is empty
+    - The member is made staff for the admin endpoints; every change is
+      rolled back after the run
+    """
+
+    def __init__(self):
+        board = Boards.objects.annotate(total=Count("tasks")).order_by("-total", "pk").first()
+        if board is None or board.total == 0:
+            seed(users=50, boards=10, tasks=1000, comments=2000, prefix="bench", password=PASSWORD)
+            board = Boards.objects.annotate(total=Count("tasks")).order_by("-total", "pk").first()
+        self.board = board
+        self.user = board.owner
+        self.user.set_password(PASSWORD)
+        self.user.is_staff = True
+        self.user.save()
+        self.token = Token.objects.get_or_create(user=self.user)[0]
+        self.task = board.tasks.annotate(total=Count("comments")).order_by("-total", "pk").first()
+        self.comment = Comment.objects.filter(task=self.task, author=self.user).first() or Comment.objects.create(
+            task=self.task, content="Benchmark comment", author=self.user
+        )
+        self.counter = itertools.count()
+
+    def client(self, kind):
+        client = APIClient(SERVER_NAME="localhost")
+        if kind == "member":
+            client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        return client
+
+    def new_task(self, *args):
+        return DashboardTasks.objects.create(
+            title="Benchmark task", description="", board=self.board,
+            assignee_id=self.user, reviewer_id=self.user,
+        )
+
+    def new_board(self, *args):
+        # The DELETE must not depend on the size of the board
+        board = Boards.objects.create(title="Benchmark board", owner=self.user)
+        DashboardTasks.objects.bulk_create(
+            DashboardTasks(title=f"Benchmark task {number}", description="", board=board) for number in range(1000)
+        )
+        return board
+
+    def new_comment(self, *args):
+        return Comment.objects.create(task=self.task, content="Benchmark comment", author=self.user)
+
+    def new_session(self, *args):
+        # Logout deletes the token, so every logout gets its own user
+        user = User.objects.create_user(f"bench.logout.{next(self.counter)}", password=None)
+        return Token.objects.create(user=user)
+
+    def task_data(self, *args):
+        return {
+            "board": self.board.pk, "title": "Benchmark task", "description": "Created by bench_endpoints",
+            "assignee_id": self.user.pk, "reviewer_id": self.user.pk, "status": "to-do", "priority": "medium",
+        }
+
+    def import_data(self, *args):
+        # A board with 100 tasks and a comment each, as NDJSON
+        records = [{"record": "board", "title": "Benchmark import", "members": [self.user.email]}]
+        for number in range(100):
+            records.append({"record": "task", "id": number, "title": f"Imported task {number}", "assignee": self.user.email})
+            records.append({"record": "comment", "task": number, "author": self.user.email, "content": "Imported comment"})
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def scenarios():
+    """
+    The benchmarked requests, at least one per route of the API.
+    """
+    board = lambda fixture, prepared: f"/api/boards/{fixture.board.pk}/"
+    task = lambda fixture, prepared: f"/api/tasks/{fixture.task.pk}/"
+    comments = lambda fixture, prepared: f"/api/tasks/{fixture.task.pk}/comments/"
+    return [
+        Scenario("register", "POST", "/api/registration/", lambda fixture, prepared: {
+            "fullname": "Bench User", "email": f"bench.register.{next(fixture.counter)}@example.com",
+            "password": PASSWORD, "repeated_password": PASSWORD,
+        }, status=201, client="anonymous"),
+        Scenario("login", "POST", "/api/login/", lambda fixture, prepared: {
+            "email": fixture.user.email, "password": PASSWORD,
+        }, client="anonymous"),
+        Scenario("logout", "POST", "/api/logout/", prepare=Fixture.new_session, client="session"),
+        Scenario("token-cache-stats", "GET", "/api/token-cache-stats/"),
+        Scenario("email-check", "GET", lambda fixture, prepared: f"/api/email-check/?email={fixture.user.email}"),
+        Scenario("email-check", "POST", "/api/email-check/", lambda fixture, prepared: {
+            "emails": [fixture.user.email.upper()] + [f"bench.missing.{number}@example.com" for number in range(49)],
+        }),
+        Scenario("board", "GET", "/api/boards/"),
+        Scenario("board", "POST", "/api/boards/", lambda fixture, prepared: {
+            "title": "Benchmark board", "members": [fixture.user.pk],
+        }, status=201),
+        Scenario("board-single-view", "GET", board),
+        Scenario("board-single-view", "PATCH", board, {"title": "Benchmark board"}),
+        Scenario("board-single-view", "DELETE", lambda fixture, prepared: f"/api/boards/{prepared.pk}/",
+                 prepare=Fixture.new_board, status=204),
+        Scenario("board-cache-stats", "GET", "/api/boards/cache-stats/"),
+        Scenario("board-events", "GET", lambda fixture, prepared: f"/api/boards/{fixture.board.pk}/events/?after=0"),
+        Scenario("board-changes", "GET", lambda fixture, prepared: (
+            f"/api/boards/{fixture.board.pk}/changes/?since={make_token(timezone.now() - timedelta(hours=1))}"
+        )),
+        Scenario("board-export", "GET", lambda fixture, prepared: f"/api/boards/{fixture.board.pk}/export/?format=ndjson"),
+        Scenario("taskview", "GET", "/api/tasks/"),
+        Scenario("taskview", "POST", "/api/tasks/", Fixture.task_data, status=201),
+        Scenario("task-bulk", "POST", "/api/tasks/bulk/", lambda fixture, prepared: [
+            fixture.task_data() for _ in range(50)
+        ], status=201),
+        Scenario("assigned-task", "GET", "/api/tasks/assigned-to-me/"),
+        Scenario("reviewing", "GET", "/api/tasks/reviewing/"),
+        Scenario("tasksSingleview", "GET", task),
+        Scenario("tasksSingleview", "PATCH", task, {"status": "in-progress"}),
+        Scenario("tasksSingleview", "DELETE", lambda fixture, prepared: f"/api/tasks/{prepared.pk}/",
+                 prepare=Fixture.new_task, status=204),
+        Scenario("task-comments", "GET", comments),
+        Scenario("task-comments", "POST", comments, {"content": "Benchmark comment"}, status=201),
+        Scenario("task-single-comments", "GET",
+                 lambda fixture, prepared: f"/api/tasks/{fixture.task.pk}/comments/{fixture.comment.pk}/"),
+        Scenario("task-single-comments", "DELETE",
+                 lambda fixture, prepared: f"/api/tasks/{fixture.task.pk}/comments/{prepared.pk}/",
+                 prepare=Fixture.new_comment, status=204),
+        Scenario("search", "GET", "/api/search/?q=review"),
+        Scenario("import", "POST", "/api/import/", Fixture.import_data, content_type="application/x-ndjson"),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Benchmark every API route through the test client.
+    - Runs against the current database (seed it with seed_data), all
+      writes are rolled back afterwards
+    - Reports p50/p95 latency, queries and response bytes per request,
+      after --warmup untimed requests that fill the caches
+    - --save stores the results as baseline, --compare reports changes
+      against it and fails on regressions
+    """
+    help = "Benchmark all API endpoints and compare against a saved baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per scenario (caches).")
+        parser.add_argument("--only", help="Comma separated route names.")
+        parser.add_argument("--baseline", default=str(Path(settings.BASE_DIR) / "bench_baseline.json"))
+        parser.add_argument("--save", action="store_true", help="Write the results to the baseline file.")
+        parser.add_argument("--compare", action="store_true", help="Compare the results with the baseline file.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown, 0.25 = 25%%.")
+        parser.add_argument("--min-delta", type=float, default=2.0, help="p95 slowdowns below this many ms are noise.")
+
+    def handle(self, *args, **options):
+        selected = scenarios()
+        if options["only"]:
+            routes = set(options["only"].split(","))
+            selected = [scenario for scenario in selected if scenario.route in routes]
+        else:
+            self.check_coverage(selected)
+
+        results = {}
+        # The long-poll must not wait for events during the benchmark
+        with override_settings(KANBAN_EVENTS={**getattr(settings, "KANBAN_EVENTS", {}), "LONG_POLL_TIMEOUT": 0}):
+            try:
+                with transaction.atomic():
+                    fixture = Fixture()
+                    self.stdout.write(
+                        f"board {fixture.board.pk}: {fixture.board.total} tasks, "
+                        f"task {fixture.task.pk}: {fixture.task.total} comments"
+                    )
+                    for scenario in selected:
+                        self.measure(scenario, fixture, options["warmup"])
+                        results[scenario.key] = self.measure(scenario, fixture, options["repeat"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+        self.report(results)
+        if options["compare"]:
+            self.compare(results, options["baseline"], options["tolerance"], options["min_delta"])
+        if options["save"]:
+            Path(options["baseline"]).write_text(json.dumps({
+                "created": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "repeat": options["repeat"],
+                "warmup": options["warmup"],
+                "results": results,
+            }, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+
+    def check_coverage(self, selected):
+        routes = {pattern.name for pattern in kanban_urls.urlpatterns + auth_urls.urlpatterns}
+        missing = routes - {scenario.route for scenario in selected}
+        if missing:
+            self.stderr.write(f"Routes without a scenario: {', '.join(sorted(missing))}")
+
+    def measure(self, scenario, fixture, repeat):
+        timings, query_counts, sizes = [], [], []
+        if not repeat:
+            return None
+        for _ in range(repeat):
+            prepared = scenario.prepare(fixture) if scenario.prepare else None
+            if scenario.client == "session":
+                client = fixture.client("anonymous")
+                client.credentials(HTTP_AUTHORIZATION=f"Token {prepared.key}")
+            else:
+                client = fixture.client(scenario.client)
+            path = scenario.resolve(scenario.path, fixture, prepared)
+            data = scenario.resolve(scenario.data, fixture, prepared)
+            request = getattr(client, scenario.method.lower())
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                if data is None:
+                    response = request(path)
+                elif scenario.content_type:
+                    response = request(path, data, content_type=scenario.content_type)
+                else:
+                    response = request(path, data, format="json")
+                size = response_size(response)
+                timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != scenario.status:
+                raise CommandError(f"{scenario.key}: expected {scenario.status}, got {response.status_code}")
+            query_counts.append(len(queries))
+            sizes.append(size)
+        return {
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "queries": max(query_counts),
+            "bytes": round(statistics.median(sizes)),
+        }
+
+    def report(self, results):
+        self.stdout.write(f"{'request':<34} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'bytes':>10}")
+        for key, result in results.items():
+            self.stdout.write(
+                f"{key:<34} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['queries']:>8} {result['bytes']:>10}"
+            )
+
+    def compare(self, results, path, tolerance, min_delta):
+        """
+        Print the changes against the baseline.
+        - Regressions: p95 slower than the tolerance allows (and by at least
+          min_delta ms), or more queries
+        """
+        try:
+            baseline = json.loads(Path(path).read_text())["results"]
+        except FileNotFoundError:
+            raise CommandError(f"No baseline at {path}, create one with --save.")
+        regressions = []
+        self.stdout.write(f"\n{'request':<34} {'p95 change':>11} {'queries':>9} {'bytes':>12}")
+        for key, result in results.items():
+            before = baseline.get(key)
+            if before is None:
+                self.stdout.write(f"{key:<34} {'new':>11}")
+                continue
+            change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0
+            queries = result["queries"] - before["queries"]
+            size = result["bytes"] - before["bytes"]
+            self.stdout.write(f"{key:<34} {change:>+10.0%} {queries:>+9} {size:>+12}")
+            if (change > tolerance and result["p95_ms"] - before["p95_ms"] > min_delta) or queries > 0:
+                regressions.append(key)
+        if regressions:
+            raise CommandError(f"Regressions against the baseline: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
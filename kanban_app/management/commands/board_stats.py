@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.stats import rebuild_board_stats, verify_board_stats
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or verify the denormalized BoardStats rows.
+    - Default: recompute all counters in batches
+    - --verify: only report boards whose stored counters are wrong
+    """
+    help = "Rebuild or verify the per-board statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true", help="Report mismatches instead of rebuilding.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if not options["verify"]:
+            written = rebuild_board_stats(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt statistics for {written} boards."))
+            return
+
+        mismatches = 0
+        for board_id, stored, expected in verify_board_stats(batch_size=batch_size):
+            mismatches += 1
+            self.stdout.write(f"Board {board_id}: stored {stored}, expected {expected}")
+        if mismatches:
+            raise CommandError(f"{mismatches} boards have wrong statistics.")
+        self.stdout.write(self.style.SUCCESS("All board statistics are correct."))
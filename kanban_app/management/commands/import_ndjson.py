@@ -0,0 +1,65 @@
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.importer import Importer, import_config
+from kanban_app.models import Boards
+
+
+class Command(BaseCommand):
+    """
+    Import boards, tasks and comments from an NDJSON file (or - for stdin).
+    - Same format and behaviour as POST /api/import/, see kanban_app.importer
+    - The "owner" of board records is kept; boards without a known owner
+      belong to --user
+    - Prints progress every --progress lines and the skipped lines at the end
+    """
+    help = "Import boards, tasks and comments from NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, - reads stdin.")
+        parser.add_argument("--user", required=True, help="Email of the importing user.")
+        parser.add_argument("--board", type=int, help="Board for tasks before the first board record.")
+        parser.add_argument("--batch-size", type=int, default=import_config()["BATCH_SIZE"])
+        parser.add_argument("--progress", type=int, default=100_000, help="Report every this many lines.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email__iexact=options["user"]).order_by("pk").first()
+        if user is None:
+            raise CommandError(f"Unknown user {options['user']}.")
+        board = None
+        if options["board"] is not None:
+            board = Boards.objects.filter(pk=options["board"]).first()
+            if board is None:
+                raise CommandError(f"Unknown board {options['board']}.")
+
+        start = time.perf_counter()
+        next_report = [options["progress"]]
+
+        def progress(report):
+            if report.lines >= next_report[0]:
+                next_report[0] = report.lines + options["progress"]
+                created = ", ".join(f"{count} {name}" for name, count in report.created.items())
+                self.stdout.write(
+                    f"  {report.lines} lines, {created}, {report.error_count} errors"
+                    f" ({time.perf_counter() - start:.0f}s)"
+                )
+
+        importer = Importer(
+            user, board=board, keep_owners=True, batch_size=options["batch_size"], progress=progress,
+        )
+        if options["path"] == "-":
+            report = importer.run(sys.stdin)
+        else:
+            with open(options["path"], encoding="utf-8") as lines:
+                report = importer.run(lines)
+
+        for issue in report.errors + report.warnings:
+            self.stdout.write(f"  line {issue['line']}: {issue.get('error') or issue.get('warning')}")
+        created = ", ".join(f"{count} {name}" for name, count in report.created.items())
+        message = (
+            f"Imported {created} from {report.lines} lines in {time.perf_counter() - start:.1f}s, "
+            f"{report.error_count} errors, {report.warning_count} warnings."
+        )
+        self.stdout.write(self.style.WARNING(message) if report.error_count else self.style.SUCCESS(message))
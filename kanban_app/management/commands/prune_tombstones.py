@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from kanban_app.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    """
+    Delete delta sync tombstones older than KANBAN_SYNC["TOMBSTONE_DAYS"].
+    - Sync tokens older than the retention get a 410 and resync from scratch
+    """
+    help = "Delete old delta sync tombstones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override the retention in days.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(days=options["days"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones."))
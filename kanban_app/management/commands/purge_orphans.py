@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from kanban_app.models import PurgeJob
+from kanban_app.purge import enqueue, orphan_counts, purge_config, run_jobs
+
+
+class Command(BaseCommand):
+    """
+    Run the queued purge jobs and delete the orphaned rows.
+    - Jobs whose worker died are taken over once their lease expired
+    - Orphans are tasks without a board and comments without a task, left by
+      deletions that did not go through the purge queue (e.g. older ones)
+    - Batches of --batch-size rows, one transaction each; prints every batch
+    - --dry-run only reports the queued jobs and the orphans
+    """
+    help = "Purge deleted boards and orphaned tasks and comments in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=purge_config()["BATCH_SIZE"])
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            for job in PurgeJob.objects.order_by("pk"):
+                claimed = f"claimed {job.claimed_at:%Y-%m-%d %H:%M:%S}" if job.claimed_at else "waiting"
+                self.stdout.write(f"  job {job.pk}: {job}, {claimed}, {job.attempts} attempts")
+            counts = ", ".join(f"{count} {name}" for name, count in orphan_counts().items())
+            self.stdout.write(f"Orphans: {counts}.")
+            return
+
+        start = time.perf_counter()
+        totals = {}
+
+        def log(job, counts):
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+            deleted = ", ".join(f"{count} {name}" for name, count in counts.items())
+            self.stdout.write(f"  {job}: {deleted} ({(time.perf_counter() - start):.1f}s)")
+
+        enqueue("orphans", start=False)
+        jobs = run_jobs(batch_size=options["batch_size"], log=log)
+        deleted = ", ".join(f"{count} {name}" for name, count in totals.items()) or "nothing"
+        self.stdout.write(self.style.SUCCESS(
+            f"Ran {jobs} jobs, deleted {deleted} in {time.perf_counter() - start:.1f}s."
+        ))
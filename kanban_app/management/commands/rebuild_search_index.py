@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from kanban_app.search import search_backend, search_config
+
+
+class Command(BaseCommand):
+    """
+    Refill the task and comment search index from the tables.
+    - Streams the rows in chunks of --chunk-size (KANBAN_SEARCH["CHUNK_SIZE"])
+    - Needed after bulk imports that bypass the signals, or to repair the
+      index; the ORM fallback backend has no index and does nothing
+    """
+    help = "Rebuild the full-text search index of tasks and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=search_config()["CHUNK_SIZE"])
+
+    def handle(self, *args, **options):
+        backend = search_backend()
+        start = time.perf_counter()
+        counts = backend.rebuild(
+            chunk_size=options["chunk_size"],
+            log=lambda message: self.stdout.write(f"  {message}"),
+        )
+        if counts is None:
+            self.stdout.write(f"{type(backend).__name__} keeps no index, nothing to rebuild.")
+            return
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {counts['tasks']} tasks and {counts['comments']} comments in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,55 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from kanban_app.seeding import seed
+
+
+class Command(BaseCommand):
+    """
+    Generate synthetic users, boards, members, tasks and comments.
+    - Skewed like production data (see kanban_app.seeding.seed)
+    - Deterministic for a given --seed
+    - Usernames start with --prefix; an existing prefix is refused
+    """
+    help = "Seed the database with synthetic kanban data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--boards", type=int, default=200)
+        parser.add_argument("--tasks", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=50000)
+        parser.add_argument("--max-members", type=int, default=25, help="Upper bound of members per board.")
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent, 0 = uniform.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument("--password", default="seed-password", help="Password of all generated users.")
+        parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct words of the generated texts.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 and options["boards"]:
+            raise CommandError("Boards need at least one user.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}.user").exists():
+            raise CommandError(f"Users with the prefix '{options['prefix']}' exist already, choose another --prefix.")
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            counts = seed(
+                users=options["users"],
+                boards=options["boards"],
+                tasks=options["tasks"],
+                comments=options["comments"],
+                max_members=options["max_members"],
+                skew=options["skew"],
+                batch_size=options["batch_size"],
+                seed_value=options["seed"],
+                prefix=options["prefix"],
+                password=options["password"],
+                vocabulary_size=options["vocabulary"],
+                log=lambda message: self.stdout.write(f"  {message}"),
+            )
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {elapsed:.1f}s."))
@@ -0,0 +1,49 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from core.db_router import routing_config
+
+
+class Command(BaseCommand):
+    """
+    Copy the primary SQLite database into the SQLite replica files.
+    - Local stand-in for replication (see KANBAN_SQLITE_REPLICA in settings):
+      the replicas lag behind by up to --interval seconds
+    - Uses SQLite's online backup, readers of the replica wait for the copy
+    - Real database servers replicate on their own, other engines are refused
+    """
+    help = "Refresh the local SQLite read replicas from the primary."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Repeat every N seconds (default: copy once).")
+
+    def handle(self, *args, **options):
+        replicas = routing_config()["REPLICAS"]
+        if not replicas:
+            raise CommandError("No replicas in DATABASE_ROUTING['REPLICAS'] (set KANBAN_SQLITE_REPLICA=1).")
+        for alias in [DEFAULT_DB_ALIAS, *replicas]:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"{alias} is not a SQLite database, replication is up to the database server.")
+
+        while True:
+            for alias in replicas:
+                started = time.perf_counter()
+                self.copy(alias)
+                self.stdout.write(f"{alias}: copied in {(time.perf_counter() - started) * 1000:.0f} ms")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Replicas are up to date."))
+
+    def copy(self, alias):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        connections[alias].close()
+        target = sqlite3.connect(connections[alias].settings_dict["NAME"])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
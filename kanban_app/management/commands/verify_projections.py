@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from kanban_app.api.projections import comment_rows, comments_data, task_rows, tasks_data
+from kanban_app.api.serializer import ChangedCommentSerializer, CommentSerializer, TasksSerializer
+from kanban_app.api.views import task_list_queryset
+from kanban_app.models import Comment
+
+
+class Command(BaseCommand):
+    """
+    Contract check of the list read path (kanban_app.api.projections).
+    - Renders the same tasks and comments with the DRF serializers and with
+      the row mappers and compares the JSON byte for byte
+    - Reports the CPU time of both paths (--repeat rounds, best round)
+    """
+    help = "Verify that the task and comment row mappers match the serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=2000, help="Tasks and comments to compare.")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        tasks = task_list_queryset().order_by("pk")[:limit]
+        rows = task_rows().order_by("pk")[:limit]
+        comments = Comment.objects.select_related("author").order_by("created_at", "pk")[:limit]
+        comment_row_list = comment_rows().order_by("created_at", "pk")[:limit]
+
+        checks = [
+            ("tasks", lambda: TasksSerializer(tasks, many=True).data, lambda: tasks_data(rows)),
+            ("comments", lambda: CommentSerializer(comments, many=True).data, lambda: comments_data(comment_row_list)),
+            ("changed comments", lambda: ChangedCommentSerializer(comments, many=True).data,
+             lambda: comments_data(comment_row_list, with_task=True)),
+        ]
+        renderer = JSONRenderer()
+        failed = []
+        self.stdout.write(f"{'list':<18} {'rows':>6} {'serializer ms':>14} {'mapper ms':>10} {'speedup':>8}")
+        for name, serialized, mapped in checks:
+            reference = serialized()
+            expected = renderer.render(reference)
+            actual = renderer.render(mapped())
+            if expected != actual:
+                failed.append(name)
+                continue
+            serializer_ms = self.cpu_time(serialized, options["repeat"])
+            mapper_ms = self.cpu_time(mapped, options["repeat"])
+            speedup = serializer_ms / mapper_ms if mapper_ms else float("inf")
+            self.stdout.write(
+                f"{name:<18} {len(reference):>6} {serializer_ms:>14.1f} {mapper_ms:>10.1f} {speedup:>7.1f}x"
+            )
+        if failed:
+            raise CommandError(f"Row mappers differ from the serializers: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS("Row mappers match the serializers byte for byte."))
+
+    def cpu_time(self, build, repeat):
+        # Querysets are re-evaluated each round: fetching is part of both paths
+        best = None
+        for _ in range(repeat):
+            start = time.process_time()
+            build()
+            elapsed = (time.process_time() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from kanban_app.models import Boards
+
+
+class MembershipCache:
+    """
+    Bounded LRU cache with a TTL for board membership results.
+    - Keys are (board_id, user_id), values are booleans
+    - Lives in process memory; writes in this process invalidate it through
+      kanban_app.signals (inside the write transaction and after its commit),
+      other processes see changes after TIMEOUT seconds
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.timeout <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_board(self, board_id):
+        self._invalidate(lambda key: key[0] == board_id)
+
+    def invalidate_user(self, user_id):
+        self._invalidate(lambda key: key[1] == user_id)
+
+    def _invalidate(self, matches):
+        # Now and again after the commit: a check running before the commit
+        # reads the old membership and would cache it for TIMEOUT seconds
+        self._evict(matches)
+        transaction.on_commit(lambda: self._evict(matches))
+
+    def _evict(self, matches):
+        with self._lock:
+            for key in [key for key in self._entries if matches(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _build_cache():
+    config = getattr(settings, "KANBAN_MEMBERSHIP_CACHE", {})
+    return MembershipCache(
+        max_entries=config.get("MAX_ENTRIES", 10000),
+        timeout=config.get("TIMEOUT", 60),
+    )
+
+
+membership_cache = _build_cache()
+
+
+def _request_memo(request):
+    # Results are memoized on the request, so repeated checks are free
+    if request is None:
+        return None
+    memo = getattr(request, "_board_membership", None)
+    if memo is None:
+        memo = {}
+        request._board_membership = memo
+    return memo
+
+
+def _known_membership(user, board, request):
+    """
+    Answer a membership check without a query if possible.
+    - Returns (answer, key, memo); answer is None if the database is needed
+    """
+    if not user or not user.is_authenticated:
+        return False, None, None
+
+    if isinstance(board, Boards):
+        if board.owner_id == user.pk:
+            return True, None, None
+        prefetched = getattr(board, "_prefetched_objects_cache", {}).get("members")
+        if prefetched is not None:
+            return any(member.pk == user.pk for member in prefetched), None, None
+        board_id = board.pk
+    else:
+        board_id = board
+
+    key = (board_id, user.pk)
+    memo = _request_memo(request)
+    if memo is not None and key in memo:
+        return memo[key], key, memo
+    return membership_cache.get(key), key, memo
+
+
+def _membership_query(board_id, user_id):
+    return Boards.objects.filter(Q(owner_id=user_id) | Q(members=user_id), pk=board_id)
+
+
+def _remember(key, memo, result):
+    membership_cache.set(key, result)
+    if memo is not None:
+        memo[key] = result
+
+
+def is_board_member(user, board, request=None):
+    """
+    Return True if the user is the owner or a member of the board.
+    - board can be a Boards instance or a board id
+    - Uses an already prefetched member list when there is one
+    - Otherwise runs an indexed EXISTS query, memoized for the request and
+      cached across requests
+    """
+    result, key, memo = _known_membership(user, board, request)
+    if result is None:
+        result = _membership_query(*key).exists()
+        _remember(key, memo, result)
+    return result
+
+
+async def ais_board_member(user, board, request=None):
+    """
+    Async variant of is_board_member for the async views.
+    """
+    result, key, memo = _known_membership(user, board, request)
+    if result is None:
+        result = await _membership_query(*key).aexists()
+        _remember(key, memo, result)
+    return result
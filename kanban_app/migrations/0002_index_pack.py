@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardtasks',
+            index=models.Index(fields=['assignee_id', 'id'], name='task_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardtasks',
+            index=models.Index(fields=['reviewer_id', 'id'], name='task_reviewer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardtasks',
+            index=models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardtasks',
+            index=models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_board_stats(apps, schema_editor):
+    """
+    Create the stats rows for existing boards in one aggregate query.
+    """
+    Boards = apps.get_model('kanban_app', 'Boards')
+    BoardStats = apps.get_model('kanban_app', 'BoardStats')
+    member_count = (
+        Boards.members.through.objects.filter(boards=OuterRef('pk'))
+        .values('boards')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    boards = Boards.objects.annotate(
+        member_total=Coalesce(Subquery(member_count), 0),
+        ticket_total=Count('tasks'),
+        to_do_total=Count('tasks', filter=Q(tasks__status='to-do')),
+        high_prio_total=Count('tasks', filter=Q(tasks__priority='high')),
+    )
+    BoardStats.objects.bulk_create(
+        (
+            BoardStats(
+                board_id=board.pk,
+                member_count=board.member_total,
+                ticket_count=board.ticket_total,
+                tasks_to_do_count=board.to_do_total,
+                tasks_high_prio_count=board.high_prio_total,
+            )
+            for board in boards.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0002_index_pack'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='kanban_app.boards')),
+                ('member_count', models.IntegerField(default=0)),
+                ('ticket_count', models.IntegerField(default=0)),
+                ('tasks_to_do_count', models.IntegerField(default=0)),
+                ('tasks_high_prio_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_board_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0003_board_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
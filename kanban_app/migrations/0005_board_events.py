@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0004_board_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=32)),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='kanban_app.boards')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'id'], name='event_board_id_idx')],
+            },
+        ),
+    ]
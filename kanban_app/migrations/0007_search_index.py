@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the FTS5 table of kanban_app.search and index the existing rows.
+    - SQLite only; without FTS5 (other databases, SQLite builds without the
+      module) the search falls back to the ORM backend
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    tasks = apps.get_model('kanban_app', 'DashboardTasks')._meta.db_table
+    comments = apps.get_model('kanban_app', 'Comment')._meta.db_table
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE kanban_search USING fts5("
+                "title, body, scope, kind UNINDEXED, object_id UNINDEXED, task_id UNINDEXED, board_id UNINDEXED, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return
+        cursor.execute(
+            "INSERT INTO kanban_search (rowid, title, body, scope, kind, object_id, task_id, board_id) "
+            "SELECT id * 2, title, description, 'b' || board_id || ' t' || id, 'task', id, id, board_id "
+            f"FROM {tasks} WHERE board_id IS NOT NULL"
+        )
+        cursor.execute(
+            "INSERT INTO kanban_search (rowid, title, body, scope, kind, object_id, task_id, board_id) "
+            "SELECT c.id * 2 + 1, '', c.content, 'b' || t.board_id || ' t' || t.id, 'comment', c.id, t.id, t.board_id "
+            f"FROM {comments} c JOIN {tasks} t ON t.id = c.task_id WHERE t.board_id IS NOT NULL"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS kanban_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0006_delta_sync'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0009_purge_jobs'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='archivedtask',
+            name='archived_task_assignee_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedtask',
+            name='archived_task_reviewer_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dashboardtasks',
+            name='task_assignee_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dashboardtasks',
+            name='task_reviewer_idx',
+        ),
+    ]
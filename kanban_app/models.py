@@ -1,20 +1,49 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+
+class BoardManager(models.Manager):
+    """
+    Default manager of Boards, leaves out the boards being deleted.
+    """
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Boards(models.Model):
     """
     Represents a Kanban board.
     - title: Name of the board
     - members: Users associated with this board (ManyToMany)
     - created_date: Date when the board was created
+    - version: Increased by every write to the board, its tasks, comments or
+      members (see kanban_app.versions), used for ETags
+    - deleted_at: Set when the board is deleted; objects no longer returns it
+      and a purge job removes its rows (see kanban_app.purge), all_objects
+      still does
     """
     title = models.CharField(max_length=150)
     members = models.ManyToManyField(User, related_name="shared_boards")
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="boards_owner", null=False, blank=False)
     created_date = models.DateField(auto_now_add=True)
+    version = models.PositiveBigIntegerField(default=0, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = BoardManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        # version and deleted_at are only changed with queryset updates; a full
+        # save of a loaded instance must not write an outdated value back
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ("version", "deleted_at")
+            ]
+        super().save(*args, **kwargs)
 class DashboardTasks(models.Model):
     """
     Represents a task in the Kanban system.
@@ -27,6 +56,7 @@ class DashboardTasks(models.Model):
     - due_date: Optional deadline
     - priority: Task priority (low, medium, high)
     - status: Task status (to-do, in-progress, review, done)
+    - updated_at: Timestamp of the last change (delta sync, see kanban_app.sync)
     """
     PRIORITY_CHOICES = [
         ("low", "low priority"),
@@ -49,9 +79,46 @@ class DashboardTasks(models.Model):
     due_date = models.DateField(null=True, blank=True)
     priority = models.CharField(max_length=6, choices=PRIORITY_CHOICES, default="medium")
     status =  models.CharField(max_length=15, choices=STATUS_CHOICES, default="to-do")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Fields whose previous value the signal handlers need (board statistics)
+    TRACKED_FIELDS = ("board_id", "status", "priority")
+
+    class Meta:
+        # The assigned-to-me / reviewing lists use the implicit foreign key
+        # indexes, which end with the rowid and so already yield id order
+        indexes = [
+            # board metrics (to-do and high priority counts)
+            models.Index(fields=["board", "status"], name="task_board_status_idx"),
+            models.Index(fields=["board", "priority"], name="task_board_priority_idx"),
+            # changes of a board since a sync token
+            models.Index(fields=["board", "updated_at"], name="task_board_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_fields()
+        return instance
+
+    def remember_tracked_fields(self):
+        """
+        Store the current values of TRACKED_FIELDS as the known database state.
+        - Skipped for deferred fields, the handlers then recount the board
+        """
+        if all(field in self.__dict__ for field in self.TRACKED_FIELDS):
+            self._tracked = {field: self.__dict__[field] for field in self.TRACKED_FIELDS}
+        else:
+            self._tracked = None
+
+    def tracked_fields(self):
+        """
+        Return the last known database values of TRACKED_FIELDS, or None.
+        """
+        return getattr(self, "_tracked", None)
     
 class Comment(models.Model):
     """
@@ -61,11 +128,164 @@ class Comment(models.Model):
     - content: Text of the comment (max 300 chars)
     - created_at: Timestamp when comment was created
     - author: User who wrote the comment
+    - updated_at: Timestamp of the last change (delta sync, see kanban_app.sync)
     """
     task = models.ForeignKey(DashboardTasks, related_name="comments", null=True, blank=True, on_delete=models.SET_NULL)
     content = models.CharField(max_length=300)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE) 
 
+    class Meta:
+        indexes = [
+            # comment list of a task, ordered by (created_at, id)
+            models.Index(fields=["task", "created_at", "id"], name="comment_task_created_idx"),
+            # changes of a board since a sync token
+            models.Index(fields=["task", "updated_at"], name="comment_task_updated_idx"),
+        ]
+
+    def __str__(self):
+        return self.content[:50]
+
+
+class BoardStats(models.Model):
+    """
+    Denormalized list metrics of a board.
+    - Kept up to date by kanban_app.signals with F-expression updates
+    - Rebuilt or verified with the board_stats management command
+    """
+    board = models.OneToOneField(Boards, on_delete=models.CASCADE, related_name="stats", primary_key=True)
+    member_count = models.IntegerField(default=0)
+    ticket_count = models.IntegerField(default=0)
+    tasks_to_do_count = models.IntegerField(default=0)
+    tasks_high_prio_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Stats for board {self.board_id}"
+
+
+class BoardEvent(models.Model):
+    """
+    Append-only change log of a board, read by the events endpoint.
+    - id: cursor of the feed (Last-Event-ID)
+    - kind: e.g. "task.created", "comment.deleted", "members.changed"
+    - payload: small JSON description of the change
+    - Written by kanban_app.signals in the transaction of the change
+    """
+    board = models.ForeignKey(Boards, on_delete=models.CASCADE, related_name="events")
+    kind = models.CharField(max_length=32)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # events of a board after a cursor
+            models.Index(fields=["board", "id"], name="event_board_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} on board {self.board_id}"
+
+
+class Tombstone(models.Model):
+    """
+    Record of a task or comment that left a board, for delta sync.
+    - kind: "task" or "comment"
+    - object_id: id of the deleted (or moved) object
+    - Pruned after KANBAN_SYNC["TOMBSTONE_DAYS"] (prune_tombstones command),
+      older sync tokens get a full resync
+    """
+    KIND_CHOICES = [
+        ("task", "task"),
+        ("comment", "comment"),
+    ]
+
+    board = models.ForeignKey(Boards, on_delete=models.CASCADE, related_name="tombstones")
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # deletions of a board since a sync token
+            models.Index(fields=["board", "deleted_at"], name="tombstone_board_deleted_idx"),
+            # pruning
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
+
+
+class ArchivedTask(models.Model):
+    """
+    A done task moved out of DashboardTasks by the archive_tasks command.
+    - Same id and field names as DashboardTasks, so the task projections and
+      serializers read both tables
+    - updated_at is the last change before archiving, archived_at the move
+    - Read only, reached with ?include_archived=1 (see kanban_app.archive)
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=150)
+    description = models.TextField()
+    board = models.ForeignKey(Boards, related_name="archived_tasks", on_delete=models.SET_NULL, null=True, blank=True)
+    assignee_id = models.ForeignKey(User, related_name="archived_assigned_tasks", on_delete=models.SET_NULL, null=True, blank=True)
+    reviewer_id = models.ForeignKey(User, related_name="archived_reviewed_tasks", on_delete=models.SET_NULL, null=True, blank=True)
+    due_date = models.DateField(null=True, blank=True)
+    priority = models.CharField(max_length=6, choices=DashboardTasks.PRIORITY_CHOICES, default="medium")
+    status = models.CharField(max_length=15, choices=DashboardTasks.STATUS_CHOICES, default="done")
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "id"], name="archived_task_board_idx"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """
+    A comment of an archived task, moved together with it.
+    - Same id and field names as Comment
+    """
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(ArchivedTask, related_name="comments", on_delete=models.CASCADE)
+    content = models.CharField(max_length=300)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    author = models.ForeignKey(User, related_name="archived_comments", on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "created_at", "id"], name="archived_comment_task_idx"),
+        ]
+
+    def __str__(self):
+        return self.content[:50]
+
+
+class PurgeJob(models.Model):
+    """
+    Queued background purge, run by the worker pool of kanban_app.purge.
+    - kind: "board" removes the rows of the deleted board target_id and then
+      the board, "orphans" the tasks without a board and comments without a task
+    - claimed_at: set by the worker running the job and renewed per batch;
+      a claim older than KANBAN_PURGE["LEASE"] seconds is taken over
+    - attempts: number of claims, more than one means a run was interrupted
+    """
+    KIND_CHOICES = [
+        ("board", "board"),
+        ("orphans", "orphans"),
+    ]
+
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    target_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
     def __str__(self):
-        return self.content[:50]
\ No newline at end of file
+        return f"Purge {self.kind} {self.target_id or ''}".rstrip()
@@ -0,0 +1,227 @@
+"""
+Background purge of the rows a deletion leaves behind.
+
+DashboardTasks.board and Comment.task are SET_NULL, so a plain board delete
+runs one UPDATE over all tasks of the board inside the request and leaves
+them behind without a board; a deleted task leaves its comments behind
+without a task. Nothing reaches these rows anymore.
+
+delete_board() instead only marks the board deleted (Boards.deleted_at, left
+out by Boards.objects) and queues a "board" PurgeJob. Deleting a task queues
+an "orphans" job. The jobs live in the database and are run after the commit
+by a small thread pool (KANBAN_PURGE["WORKERS"]):
+- Rows are deleted in batches of BATCH_SIZE, one short transaction each,
+  so the workers never hold the write lock for long
+- A board job deletes the board's tasks with their comments, its archived
+  tasks, events and tombstones, and then the board row
+- Jobs are claimed with a lease; jobs of a worker that died are taken over
+  once the lease expired, by the next worker or the purge_orphans command
+
+The purge_orphans command runs the queued jobs and sweeps the orphans of
+older deletions.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from kanban_app.api.response_cache import board_response_cache
+from kanban_app.events import record_event
+from kanban_app.membership import membership_cache
+from kanban_app.models import ArchivedTask, BoardEvent, Boards, Comment, DashboardTasks, PurgeJob, Tombstone
+from kanban_app.search import search_backend
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def purge_config():
+    config = {
+        "BATCH_SIZE": 500,
+        "WORKERS": 1,
+        "LEASE": 300,
+    }
+    config.update(getattr(settings, "KANBAN_PURGE", {}))
+    return config
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=purge_config()["WORKERS"],
+            thread_name_prefix="kanban-purge",
+        )
+    return _executor
+
+
+def delete_board(board):
+    """
+    Delete a board without touching its tasks in the request.
+    - Marks the board deleted, so it and everything reached through it is
+      gone at once; the rows are removed by a "board" job
+    """
+    with transaction.atomic():
+        Boards.all_objects.filter(pk=board.pk).update(deleted_at=timezone.now())
+        record_event(board.pk, "board.deleted")
+        enqueue("board", board.pk)
+    membership_cache.invalidate_board(board.pk)
+    board_response_cache.invalidate(board.pk)
+
+
+def enqueue(kind, target_id=None, start=True):
+    """
+    Queue a purge job in the caller's transaction, started after the commit.
+    - An "orphans" job is only queued if no unclaimed one is waiting
+    - start=False leaves running it to the caller (run_jobs)
+    """
+    if kind == "orphans" and PurgeJob.objects.filter(kind=kind, claimed_at__isnull=True).exists():
+        return None
+    job = PurgeJob.objects.create(kind=kind, target_id=target_id)
+    if start:
+        transaction.on_commit(start_worker)
+    return job
+
+
+def start_worker():
+    """
+    Run the queued jobs on the worker pool; with 0 workers inline.
+    """
+    if purge_config()["WORKERS"] <= 0:
+        run_jobs()
+    else:
+        _get_executor().submit(_work)
+
+
+def _work():
+    try:
+        run_jobs()
+    except Exception:
+        # The job keeps its claim and is retried when the lease expired
+        logger.exception("Purge job failed")
+    finally:
+        # Connections are per thread, the pool thread's would stay open
+        connections.close_all()
+
+
+def claim_job():
+    """
+    Claim the oldest job that is unclaimed or whose lease expired, or None.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=purge_config()["LEASE"])
+    waiting = PurgeJob.objects.filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=expired)).order_by("pk")
+    for job in waiting[:10]:
+        # Compare and set: another worker may have claimed it in between
+        claimed = PurgeJob.objects.filter(pk=job.pk, claimed_at=job.claimed_at).update(
+            claimed_at=now, attempts=F("attempts") + 1,
+        )
+        if claimed:
+            job.claimed_at = now
+            return job
+    return None
+
+
+def run_jobs(batch_size=None, log=None):
+    """
+    Run jobs until none is left to claim, returns the number of jobs run.
+    """
+    count = 0
+    while (job := claim_job()) is not None:
+        run_job(job, batch_size, log)
+        count += 1
+    return count
+
+
+def run_job(job, batch_size=None, log=None):
+    """
+    Purge everything of a claimed job batch by batch, then drop the job.
+    - log is called with (job, counts) after every batch
+    """
+    batch_size = batch_size or purge_config()["BATCH_SIZE"]
+    steps = board_steps(job.target_id) if job.kind == "board" else orphan_steps()
+    for step in steps:
+        while counts := step(batch_size):
+            PurgeJob.objects.filter(pk=job.pk).update(claimed_at=timezone.now())
+            if log:
+                log(job, counts)
+    if job.kind == "board":
+        # Only the stats row and the memberships are left
+        Boards.all_objects.filter(pk=job.target_id, deleted_at__isnull=False).delete()
+    job.delete()
+
+
+def board_steps(board_id):
+    return [
+        lambda batch_size: purge_tasks(DashboardTasks.objects.filter(board_id=board_id), batch_size),
+        lambda batch_size: purge_tasks(ArchivedTask.objects.filter(board_id=board_id), batch_size),
+        lambda batch_size: purge_rows(BoardEvent.objects.filter(board_id=board_id), batch_size),
+        lambda batch_size: purge_rows(Tombstone.objects.filter(board_id=board_id), batch_size),
+    ]
+
+
+def orphan_steps():
+    return [
+        lambda batch_size: purge_tasks(DashboardTasks.objects.filter(board__isnull=True), batch_size),
+        lambda batch_size: purge_tasks(ArchivedTask.objects.filter(board__isnull=True), batch_size),
+        lambda batch_size: purge_comments(Comment.objects.filter(task__isnull=True), batch_size),
+    ]
+
+
+def orphan_counts():
+    """
+    Number of tasks without a board and comments without a task, per table.
+    """
+    return {
+        "tasks": DashboardTasks.objects.filter(board__isnull=True).count(),
+        "archived tasks": ArchivedTask.objects.filter(board__isnull=True).count(),
+        "comments": Comment.objects.filter(task__isnull=True).count(),
+    }
+
+
+def _raw_delete(model, ids):
+    if ids:
+        model.objects.filter(pk__in=ids)._raw_delete(model.objects.db)
+
+
+def purge_tasks(tasks, batch_size):
+    """
+    Delete the next batch of the tasks (live or archived) with their comments.
+    - Raw deletes in one transaction, no signals: the tasks are unreachable,
+      only the search index still has to forget them
+    - Returns the deleted tasks and comments by name, {} when nothing is left
+    """
+    comments = tasks.model._meta.get_field("comments").related_model
+    with transaction.atomic():
+        task_ids = list(tasks.values_list("pk", flat=True)[:batch_size])
+        if not task_ids:
+            return {}
+        comment_ids = list(comments.objects.filter(task_id__in=task_ids).values_list("pk", flat=True))
+        # Comments first (foreign key)
+        _raw_delete(comments, comment_ids)
+        _raw_delete(tasks.model, task_ids)
+        if tasks.model is DashboardTasks:
+            search_backend().remove_many(task_ids, comment_ids)
+    prefix = "archived " if tasks.model is ArchivedTask else ""
+    return {f"{prefix}tasks": len(task_ids), f"{prefix}comments": len(comment_ids)}
+
+
+def purge_comments(comments, batch_size):
+    with transaction.atomic():
+        comment_ids = list(comments.values_list("pk", flat=True)[:batch_size])
+        if not comment_ids:
+            return {}
+        _raw_delete(Comment, comment_ids)
+        search_backend().remove_many(comment_ids=comment_ids)
+    return {"comments": len(comment_ids)}
+
+
+def purge_rows(rows, batch_size):
+    with transaction.atomic():
+        ids = list(rows.values_list("pk", flat=True)[:batch_size])
+        _raw_delete(rows.model, ids)
+    return {rows.model._meta.verbose_name_plural: len(ids)} if ids else {}
@@ -0,0 +1,381 @@
+"""
+Full-text search over task titles, task descriptions and comments.
+
+Backends (KANBAN_SEARCH["BACKEND"], a dotted path or "auto"):
+- SQLiteFTSBackend: an FTS5 table (kanban_search, created by migration 0007)
+  with one row per task and comment, ranked with bm25. The scope column
+  holds a token per board and task ("b12 t345"), so the access check is
+  part of the index lookup and moves/deletes address rows without a scan.
+  Users with more than SCOPE_TOKENS boards are checked on the board_id of
+  the matching rows instead, merging thousands of board lists costs more.
+- ORMSearchBackend: icontains lookups for databases without an FTS index.
+"auto" uses the FTS5 table where it exists and falls back to the ORM.
+
+kanban_app.signals keeps the index in sync with the create, update and
+delete paths; rebuild_search_index refills it from the tables.
+"""
+import base64
+import itertools
+import json
+import re
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+from kanban_app.models import Comment, DashboardTasks
+
+SNIPPET_MARKERS = ("[", "]")
+
+
+def search_config():
+    config = {
+        "BACKEND": "auto",
+        "MAX_TERMS": 8,
+        "SCOPE_TOKENS": 100,
+        "CHUNK_SIZE": 2000,
+    }
+    config.update(getattr(settings, "KANBAN_SEARCH", {}))
+    return config
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def search_terms(query):
+    """
+    Split a query into lowercase word terms, at most MAX_TERMS.
+    - Operators and quotes are dropped, every term has to match
+    """
+    return re.findall(r"\w+", query.lower())[:search_config()["MAX_TERMS"]]
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a search cursor into its (rank, key) pair, raises InvalidCursor.
+    """
+    try:
+        rank, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(rank, (int, float)) or not isinstance(key, int):
+        raise InvalidCursor(cursor)
+    return rank, key
+
+
+def row_key(kind, object_id):
+    # Tasks and comments share the index, their ids map to even and odd keys
+    return object_id * 2 + (kind == "comment")
+
+
+class SearchBackend:
+    """
+    Interface of the search backends.
+    - The index methods are called inside the write's transaction
+    - search() returns up to limit hits ordered by (rank, key), starting
+      after the (rank, key) pair of the previous page
+    - The defaults index and find nothing
+    """
+
+    def index_tasks(self, tasks):
+        pass
+
+    def move_task(self, task_id, board_id):
+        pass
+
+    def remove_task(self, task_id):
+        pass
+
+    def index_comment(self, comment, board_id):
+        pass
+
+    def index_comments(self, comments):
+        # (comment, board_id) pairs
+        for comment, board_id in comments:
+            self.index_comment(comment, board_id)
+
+    def remove_comment(self, comment_id):
+        pass
+
+    def remove_many(self, task_ids=(), comment_ids=()):
+        for task_id in task_ids:
+            self.remove_task(task_id)
+        for comment_id in comment_ids:
+            self.remove_comment(comment_id)
+
+    def remove_board(self, board_id):
+        pass
+
+    def rebuild(self, chunk_size=None, log=None):
+        pass
+
+    def search(self, terms, board_ids, limit, after=None):
+        return []
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """
+    FTS5 index in the kanban_search table.
+    - bm25 ranking, title matches weigh four times the body
+    - Ranks depend on the whole index, pages of a search that runs while
+      rows change may overlap or skip a hit
+    """
+    table = "kanban_search"
+    weights = "4.0, 1.0, 0.0"
+
+    @classmethod
+    def available(cls, connection):
+        return connection.vendor == "sqlite" and cls.table in connection.introspection.table_names()
+
+    def writer(self):
+        return connections[router.db_for_write(DashboardTasks)].cursor()
+
+    def reader(self):
+        return connections[router.db_for_read(DashboardTasks)].cursor()
+
+    def upsert(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {self.table} (rowid, title, body, scope, kind, object_id, task_id, board_id)"
+            " VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+    def task_row(self, task_id, board_id, title, description):
+        return (row_key("task", task_id), title, description, f"b{board_id} t{task_id}", "task", task_id, task_id, board_id)
+
+    def comment_row(self, comment_id, task_id, board_id, content):
+        return (row_key("comment", comment_id), "", content, f"b{board_id} t{task_id}", "comment", comment_id, task_id, board_id)
+
+    def index_tasks(self, tasks):
+        rows, removed = [], []
+        for task in tasks:
+            if task.board_id:
+                rows.append(self.task_row(task.pk, task.board_id, task.title, task.description))
+            else:
+                removed.append((row_key("task", task.pk),))
+        with self.writer() as cursor:
+            if rows:
+                self.upsert(cursor, rows)
+            if removed:
+                cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", removed)
+
+    def move_task(self, task_id, board_id):
+        # The task's comments follow it to the new board
+        with self.writer() as cursor:
+            cursor.execute(
+                f"UPDATE {self.table} SET scope = %s, board_id = %s WHERE {self.table} MATCH %s",
+                [f"b{board_id} t{task_id}", board_id, f"scope : t{task_id}"],
+            )
+
+    def remove_task(self, task_id):
+        # Also the task's comments, which keep existing without a task
+        with self.writer() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE {self.table} MATCH %s", [f"scope : t{task_id}"])
+
+    def index_comment(self, comment, board_id):
+        with self.writer() as cursor:
+            if board_id:
+                self.upsert(cursor, [self.comment_row(comment.pk, comment.task_id, board_id, comment.content)])
+            else:
+                cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [row_key("comment", comment.pk)])
+
+    def index_comments(self, comments):
+        rows = [
+            self.comment_row(comment.pk, comment.task_id, board_id, comment.content)
+            for comment, board_id in comments if board_id
+        ]
+        if rows:
+            with self.writer() as cursor:
+                self.upsert(cursor, rows)
+
+    def remove_comment(self, comment_id):
+        with self.writer() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [row_key("comment", comment_id)])
+
+    def remove_many(self, task_ids=(), comment_ids=()):
+        # By rowid, the ids of all comments are known
+        keys = [(row_key("task", task_id),) for task_id in task_ids]
+        keys += [(row_key("comment", comment_id),) for comment_id in comment_ids]
+        if keys:
+            with self.writer() as cursor:
+                cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", keys)
+
+    def remove_board(self, board_id):
+        with self.writer() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE {self.table} MATCH %s", [f"scope : b{board_id}"])
+
+    def rebuild(self, chunk_size=None, log=None):
+        """
+        Refill the index from the tables in one transaction.
+        - Rows are streamed with iterator() and written chunk by chunk, so
+          memory stays flat; searches see the old index until the commit
+        - Returns the number of indexed tasks and comments
+        """
+        chunk_size = chunk_size or search_config()["CHUNK_SIZE"]
+        log = log or (lambda message: None)
+        tasks = (
+            DashboardTasks.objects.filter(board__isnull=False)
+            .order_by("pk")
+            .values_list("pk", "board_id", "title", "description")
+        )
+        comments = (
+            Comment.objects.filter(task__board__isnull=False)
+            .order_by("pk")
+            .values_list("pk", "task_id", "task__board_id", "content")
+        )
+        counts = {"tasks": 0, "comments": 0}
+        with transaction.atomic(using=router.db_for_write(DashboardTasks)), self.writer() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            for name, rows, make_row in (("tasks", tasks, self.task_row), ("comments", comments, self.comment_row)):
+                iterator = rows.iterator(chunk_size=chunk_size)
+                while chunk := list(itertools.islice(iterator, chunk_size)):
+                    self.upsert(cursor, [make_row(*row) for row in chunk])
+                    counts[name] += len(chunk)
+                    log(f"{counts[name]} {name}")
+            # Merge the index segments written by the chunks
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return counts
+
+    def search(self, terms, board_ids, limit, after=None):
+        if not terms or not board_ids:
+            return []
+        quoted = " AND ".join(f'"{term}"' for term in terms)
+        match = f"{{title body}} : ({quoted})"
+        rank = f"bm25({self.table}, {self.weights})"
+        scope = ""
+        if len(board_ids) <= search_config()["SCOPE_TOKENS"]:
+            match += " AND scope : (" + " OR ".join(f"b{board_id}" for board_id in board_ids) + ")"
+            params = [match]
+        else:
+            scope = " AND board_id IN (SELECT value FROM json_each(%s))"
+            params = [match, json.dumps(list(board_ids))]
+        keyset = ""
+        if after is not None:
+            keyset = f" AND ({rank}, rowid) > (%s, %s)"
+            params += list(after)
+        opening, closing = SNIPPET_MARKERS
+        sql = (
+            f"SELECT rowid, {rank}, kind, object_id, task_id, board_id, title,"
+            f" snippet({self.table}, 1, %s, %s, '…', 16)"
+            f" FROM {self.table} WHERE {self.table} MATCH %s{scope}{keyset}"
+            f" ORDER BY {rank}, rowid LIMIT %s"
+        )
+        with self.reader() as cursor:
+            cursor.execute(sql, [opening, closing, *params, limit])
+            rows = cursor.fetchall()
+        return [
+            {
+                "type": kind,
+                "id": object_id,
+                "task": task_id,
+                "board": board_id,
+                "title": title if kind == "task" else None,
+                "snippet": snippet,
+                "key": [score, key],
+            }
+            for key, score, kind, object_id, task_id, board_id, title, snippet in rows
+        ]
+
+
+def mark_terms(text, terms, width=80):
+    """
+    Cut text around the first matching term and mark the matches.
+    """
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - width // 2) if match else 0
+    excerpt = text[start:start + width]
+    opening, closing = SNIPPET_MARKERS
+    excerpt = pattern.sub(lambda found: f"{opening}{found.group(0)}{closing}", excerpt)
+    return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
+
+
+class ORMSearchBackend(SearchBackend):
+    """
+    icontains search for databases without an FTS index.
+    - Every term has to occur in the title or description (tasks) or the
+      content (comments)
+    - Rank 0: all terms in the title, 1: other task matches, 2: comments
+    - Scans the tasks and comments of the accessible boards; the index
+      methods are no-ops
+    """
+
+    def matches(self, fields, terms):
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for field in fields:
+                term_condition |= Q(**{f"{field}__icontains": term})
+            condition &= term_condition
+        return condition
+
+    def search(self, terms, board_ids, limit, after=None):
+        if not terms or not board_ids:
+            return []
+        in_title = Q()
+        for term in terms:
+            in_title &= Q(title__icontains=term)
+        tasks = (
+            DashboardTasks.objects.filter(self.matches(("title", "description"), terms), board_id__in=board_ids)
+            .annotate(
+                rank=Case(When(in_title, then=Value(0)), default=Value(1), output_field=IntegerField()),
+                key=F("pk") * 2,
+            )
+        )
+        comments = (
+            Comment.objects.filter(self.matches(("content",), terms), task__board_id__in=board_ids)
+            .annotate(rank=Value(2, output_field=IntegerField()), key=F("pk") * 2 + 1)
+        )
+        if after is not None:
+            rank, key = after
+            keyset = Q(rank__gt=rank) | Q(rank=rank, key__gt=key)
+            tasks, comments = tasks.filter(keyset), comments.filter(keyset)
+        hits = [
+            {
+                "type": "task",
+                "id": task["pk"],
+                "task": task["pk"],
+                "board": task["board_id"],
+                "title": task["title"],
+                "snippet": mark_terms(task["description"], terms),
+                "key": [task["rank"], task["key"]],
+            }
+            for task in tasks.order_by("rank", "key").values("pk", "board_id", "title", "description", "rank", "key")[:limit]
+        ]
+        hits += [
+            {
+                "type": "comment",
+                "id": comment["pk"],
+                "task": comment["task_id"],
+                "board": comment["task__board_id"],
+                "title": None,
+                "snippet": mark_terms(comment["content"], terms),
+                "key": [comment["rank"], comment["key"]],
+            }
+            for comment in comments.order_by("key").values("pk", "task_id", "task__board_id", "content", "rank", "key")[:limit]
+        ]
+        hits.sort(key=lambda hit: hit["key"])
+        return hits[:limit]
+
+
+_backend = None
+
+
+def search_backend():
+    """
+    The configured backend, created on first use.
+    """
+    global _backend
+    if _backend is None:
+        path = search_config()["BACKEND"]
+        if path == "auto":
+            connection = connections[router.db_for_write(DashboardTasks)]
+            _backend = SQLiteFTSBackend() if SQLiteFTSBackend.available(connection) else ORMSearchBackend()
+        else:
+            _backend = import_string(path)()
+    return _backend
@@ -0,0 +1,157 @@
+import itertools
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from kanban_app.models import Boards, Comment, DashboardTasks
+from kanban_app.search import search_backend
+from kanban_app.stats import rebuild_board_stats
+
+STATUS_WEIGHTS = {"to-do": 40, "in-progress": 25, "review": 10, "done": 25}
+PRIORITY_WEIGHTS = {"low": 30, "medium": 50, "high": 20}
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Eva", "Felix", "Greta", "Hannes", "Ida", "Jonas", "Lena", "Max"]
+LAST_NAMES = ["Bauer", "Fischer", "Huber", "Keller", "Koch", "Maier", "Müller", "Schmid", "Wagner", "Weber"]
+WORDS = ["api", "backlog", "bug", "deploy", "design", "docs", "login", "migration", "release", "review", "sprint", "test"]
+SYLLABLES = ["ba", "ce", "di", "fo", "gu", "ka", "le", "mi", "no", "pu", "ra", "se", "ti", "vo", "zu"]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def skewed_picker(rng, population, exponent):
+    """
+    Return a function drawing k items of population with Zipf-like weights.
+    - Popularity is shuffled, so hot items are not simply the lowest ids
+    """
+    population = list(population)
+    rng.shuffle(population)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(len(population))))
+
+    def pick(k=1):
+        return rng.choices(population, cum_weights=cum_weights, k=k)
+    return pick
+
+
+def vocabulary(rng, size):
+    """
+    WORDS plus size made-up words, in a deterministic order.
+    """
+    words = set(WORDS)
+    while len(words) < len(WORDS) + size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def bulk_insert(model, objects, batch_size):
+    """
+    Insert a stream of unsaved objects with bulk_create, batch by batch.
+    - Returns the primary keys of the inserted rows
+    """
+    pks = []
+    for batch in batched(objects, batch_size):
+        pks.extend(obj.pk for obj in model.objects.bulk_create(batch))
+    return pks
+
+
+def seed(users, boards, tasks, comments, max_members=25, skew=1.1, batch_size=1000,
+         seed_value=0, prefix="seed", password="seed-password", vocabulary_size=5000, log=None):
+    """
+    Fill the database with synthetic users, boards, members, tasks and comments.
+    - Sizes follow Zipf-like distributions: few users own or join many
+      boards, few boards hold most tasks, few tasks get most comments
+    - Texts draw from a vocabulary of vocabulary_size words with Zipf
+      weights, so searches see few frequent and many rare terms
+    - Rows are generated lazily and written with bulk_create in batches of
+      batch_size, so memory stays flat apart from the id lists
+    - All users share one password hash (password)
+    - bulk_create sends no signals, the board statistics and the search
+      index are rebuilt at the end
+    - Returns the number of created rows per model
+    """
+    rng = random.Random(seed_value)
+    log = log or (lambda message: None)
+    password_hash = make_password(password)
+
+    user_ids = bulk_insert(User, (
+        User(
+            username=f"{prefix}.user{number}",
+            email=f"{prefix}.user{number}@example.com",
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            password=password_hash,
+        )
+        for number in range(users)
+    ), batch_size)
+    log(f"{len(user_ids)} users")
+
+    pick_user = skewed_picker(rng, user_ids, skew)
+    owners = pick_user(boards)
+    board_ids = bulk_insert(Boards, (
+        Boards(title=f"{rng.choice(WORDS).title()} board {number}", owner_id=owners[number])
+        for number in range(boards)
+    ), batch_size)
+    log(f"{len(board_ids)} boards")
+
+    # Member counts are heavy-tailed: most boards are small teams
+    members = {}
+    for board_id, owner_id in zip(board_ids, owners):
+        size = min(max_members, int(rng.paretovariate(1.2)))
+        members[board_id] = list({owner_id, *pick_user(size)})
+    through = Boards.members.through
+    memberships = bulk_insert(through, (
+        through(boards_id=board_id, user_id=user_id)
+        for board_id, user_ids_of_board in members.items()
+        for user_id in user_ids_of_board
+    ), batch_size)
+    log(f"{len(memberships)} memberships")
+
+    statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+    priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+    pick_board = skewed_picker(rng, board_ids, skew)
+    task_boards = pick_board(tasks) if board_ids else []
+    today = date.today()
+    pick_word = skewed_picker(rng, vocabulary(rng, vocabulary_size), 1.0)
+
+    def task(number, board_id):
+        team = members[board_id]
+        return DashboardTasks(
+            title=f"{pick_word()[0].title()} {pick_word()[0]} #{number}",
+            description=" ".join(pick_word(rng.randint(3, 30))),
+            board_id=board_id,
+            assignee_id_id=rng.choice(team),
+            reviewer_id_id=rng.choice(team),
+            due_date=today + timedelta(days=rng.randint(-60, 90)) if rng.random() < 0.6 else None,
+            status=rng.choices(statuses, status_weights)[0],
+            priority=rng.choices(priorities, priority_weights)[0],
+        )
+
+    task_ids = bulk_insert(DashboardTasks, (task(number, board_id) for number, board_id in enumerate(task_boards)), batch_size)
+    log(f"{len(task_ids)} tasks")
+
+    board_of_task = dict(zip(task_ids, task_boards))
+    pick_task = skewed_picker(rng, task_ids, skew)
+    comment_tasks = pick_task(comments) if task_ids else []
+    comment_ids = bulk_insert(Comment, (
+        Comment(
+            task_id=task_id,
+            author_id=rng.choice(members[board_of_task[task_id]]),
+            content=" ".join(pick_word(rng.randint(2, 40)))[:300],
+        )
+        for task_id in comment_tasks
+    ), batch_size)
+    log(f"{len(comment_ids)} comments")
+
+    # Boards are walked in batches; a huge IN list of the new ids would hit SQLite's parameter limit
+    rebuild_board_stats(batch_size=batch_size)
+    search_backend().rebuild(chunk_size=batch_size)
+    return {
+        "users": len(user_ids),
+        "boards": len(board_ids),
+        "memberships": len(memberships),
+        "tasks": len(task_ids),
+        "comments": len(comment_ids),
+    }
@@ -0,0 +1,196 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from kanban_app.models import Boards, BoardStats, Comment, DashboardTasks
+from kanban_app.api.response_cache import board_response_cache
+from kanban_app.events import record_event, record_events
+from kanban_app.membership import membership_cache
+from kanban_app.purge import enqueue as enqueue_purge
+from kanban_app.search import search_backend
+from kanban_app.stats import apply_task_change, count_created_tasks, rebuild_board_stats, refresh_member_count
+from kanban_app.sync import record_tombstone, record_tombstones
+from kanban_app.versions import bump_board_versions
+
+
+def task_payload(task):
+    return {"id": task.pk, "title": task.title, "status": task.status, "priority": task.priority}
+
+
+def tasks_changed_in_bulk(board_ids, tasks=()):
+    """
+    Counterpart of the task handlers below for bulk_create/bulk_update,
+    which send no signals.
+    - Recounts the statistics and bumps the versions of the given boards
+    - Indexes tasks (instances) whose title, description or board changed
+    """
+    board_ids = [board_id for board_id in set(board_ids) if board_id]
+    rebuild_board_stats(board_ids)
+    if tasks:
+        search_backend().index_tasks(tasks)
+    bump_board_versions(board_ids)
+    board_response_cache.invalidate(*board_ids)
+    record_events(board_ids, "tasks.changed")
+
+
+def tasks_created_in_bulk(tasks):
+    """
+    Counterpart of task_saved for tasks created with bulk_create.
+    - Adds the tasks to the board statistics instead of recounting the boards
+    """
+    board_ids = {task.board_id for task in tasks if task.board_id}
+    count_created_tasks(tasks)
+    search_backend().index_tasks(tasks)
+    bump_board_versions(board_ids)
+    board_response_cache.invalidate(*board_ids)
+    record_events(board_ids, "tasks.changed")
+
+
+def comments_created_in_bulk(comments):
+    """
+    Counterpart of comment_changed for comments created with bulk_create.
+    - comments: (comment, board_id) pairs
+    """
+    board_ids = {board_id for comment, board_id in comments if board_id}
+    # The comment counts of the tasks changed, delta sync has to send them again
+    task_ids = {comment.task_id for comment, board_id in comments}
+    DashboardTasks.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+    search_backend().index_comments(comments)
+    bump_board_versions(board_ids)
+    board_response_cache.invalidate(*board_ids)
+    record_events(board_ids, "comments.changed")
+
+
+def tasks_archived(tasks, comment_ids):
+    """
+    Counterpart of task_deleted for tasks moved to the archive without signals.
+    - tasks: the archived tasks (ArchivedTask), comment_ids: their comments
+    - Delta sync clients drop the tasks through their tombstones
+    """
+    board_ids = {task.board_id for task in tasks if task.board_id}
+    count_created_tasks(tasks, sign=-1)
+    search_backend().remove_many([task.pk for task in tasks], comment_ids)
+    record_tombstones("task", [(task.board_id, task.pk) for task in tasks])
+    bump_board_versions(board_ids)
+    board_response_cache.invalidate(*board_ids)
+    record_events(board_ids, "tasks.archived")
+
+
+@receiver(m2m_changed, sender=Boards.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep membership cache, member counts and versions in sync with board members.
+    - Forward (board.members.add): instance is the board
+    - Reverse (user.shared_boards.add): instance is the user, pk_set the boards
+    """
+    if action == "pre_clear" and reverse:
+        # The cleared boards are unknown after the clear, remember them now
+        instance._cleared_board_ids = list(instance.shared_boards.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        board_ids = [instance.pk]
+        user_ids = sorted(pk_set) if pk_set is not None else None
+    elif pk_set is None:
+        board_ids = getattr(instance, "_cleared_board_ids", [])
+        membership_cache.invalidate_user(instance.pk)
+        user_ids = [instance.pk]
+    else:
+        board_ids = list(pk_set)
+        user_ids = [instance.pk]
+    for board_id in board_ids:
+        membership_cache.invalidate_board(board_id)
+    refresh_member_count(board_ids)
+    bump_board_versions(board_ids)
+    record_events(board_ids, "members.changed", {"action": action[len("post_"):], "users": user_ids})
+
+
+@receiver(post_save, sender=Boards)
+def board_saved(sender, instance, created, **kwargs):
+    if created:
+        # board_id, not board=instance: the reverse cache would keep the zero counters
+        BoardStats.objects.create(board_id=instance.pk)
+    else:
+        # The owner may have changed
+        membership_cache.invalidate_board(instance.pk)
+        bump_board_versions([instance.pk])
+        record_event(instance.pk, "board.updated", {"title": instance.title})
+
+
+@receiver(post_delete, sender=Boards)
+def board_deleted(sender, instance, **kwargs):
+    membership_cache.invalidate_board(instance.pk)
+    # Boards deleted with delete_board() have no tasks left; any other delete
+    # leaves them without a board (SET_NULL) for the purge_orphans command
+    search_backend().remove_board(instance.pk)
+
+
+@receiver(post_save, sender=DashboardTasks)
+def task_saved(sender, instance, created, **kwargs):
+    """
+    Update the board statistics and versions for a created or changed task.
+    - Uses the values loaded from the database to compute the deltas
+    - Instances with unknown previous values recount the affected boards
+    """
+    new = (instance.board_id, instance.status, instance.priority)
+    previous = instance.tracked_fields()
+    if created:
+        apply_task_change(None, new)
+    elif previous is not None:
+        old = (previous["board_id"], previous["status"], previous["priority"])
+        if old != new:
+            apply_task_change(old, new)
+    else:
+        rebuild_board_stats([instance.board_id])
+    old_board_id = previous and previous["board_id"]
+    bump_board_versions([instance.board_id, old_board_id])
+    search_backend().index_tasks([instance])
+    if old_board_id and old_board_id != instance.board_id:
+        record_event(old_board_id, "task.removed", {"id": instance.pk})
+        record_tombstone(old_board_id, "task", instance.pk)
+        # The comments moved along, delta sync of the new board has to send them
+        Comment.objects.filter(task_id=instance.pk).update(updated_at=timezone.now())
+        if instance.board_id:
+            search_backend().move_task(instance.pk, instance.board_id)
+        else:
+            search_backend().remove_task(instance.pk)
+    record_event(instance.board_id, "task.created" if created else "task.updated", task_payload(instance))
+    instance.remember_tracked_fields()
+
+
+@receiver(post_delete, sender=DashboardTasks)
+def task_deleted(sender, instance, **kwargs):
+    previous = instance.tracked_fields()
+    if previous is not None:
+        apply_task_change((previous["board_id"], previous["status"], previous["priority"]), None)
+    else:
+        apply_task_change((instance.board_id, instance.status, instance.priority), None)
+    board_id = previous["board_id"] if previous is not None else instance.board_id
+    bump_board_versions([instance.board_id, board_id])
+    record_event(board_id, "task.deleted", {"id": instance.pk})
+    record_tombstone(board_id, "task", instance.pk)
+    search_backend().remove_task(instance.pk)
+    # The comments stay without a task (SET_NULL), purged in the background
+    enqueue_purge("orphans")
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, signal, created=False, **kwargs):
+    # Comment counts are part of the board payload
+    if not instance.task_id:
+        return
+    task = DashboardTasks.objects.filter(pk=instance.task_id)
+    if signal is post_delete or created:
+        # The task's comment count changed, delta sync has to send it again
+        task.update(updated_at=timezone.now())
+    board_id = task.values_list("board_id", flat=True).first()
+    bump_board_versions([board_id])
+    if signal is post_delete:
+        kind = "comment.deleted"
+        record_tombstone(board_id, "comment", instance.pk)
+        search_backend().remove_comment(instance.pk)
+    else:
+        kind = "comment.created" if created else "comment.updated"
+        search_backend().index_comment(instance, board_id)
+    record_event(board_id, kind, {"id": instance.pk, "task": instance.task_id})
@@ -0,0 +1,159 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from kanban_app.models import Boards, BoardStats
+
+METRIC_FIELDS = ("member_count", "ticket_count", "tasks_to_do_count", "tasks_high_prio_count")
+
+
+def member_count_subquery():
+    """
+    Correlated subquery counting the members of the outer board.
+    """
+    return Coalesce(
+        Subquery(
+            Boards.members.through.objects.filter(boards=OuterRef("pk"))
+            .values("boards")
+            .annotate(total=Count("pk"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def with_metrics(queryset):
+    """
+    Annotate a Boards queryset with all list metrics in one grouped query.
+    - member_count is a subquery, so the members do not multiply the task rows
+    """
+    return queryset.annotate(
+        member_count=member_count_subquery(),
+        ticket_count=Count("tasks"),
+        tasks_to_do_count=Count("tasks", filter=Q(tasks__status="to-do")),
+        tasks_high_prio_count=Count("tasks", filter=Q(tasks__priority="high")),
+    )
+
+
+def task_counters(board_id, status, priority):
+    """
+    Return the counters a task with these values contributes to its board.
+    """
+    if not board_id:
+        return {}
+    return {
+        "ticket_count": 1,
+        "tasks_to_do_count": 1 if status == "to-do" else 0,
+        "tasks_high_prio_count": 1 if priority == "high" else 0,
+    }
+
+
+def apply_task_change(old, new):
+    """
+    Move a task's contribution from the old to the new values.
+    - old/new are (board_id, status, priority) tuples or None
+    - One F-expression UPDATE per affected board
+    """
+    deltas = {}
+    for values, sign in ((old, -1), (new, 1)):
+        if values is None:
+            continue
+        board_deltas = deltas.setdefault(values[0], {})
+        for field, amount in task_counters(*values).items():
+            board_deltas[field] = board_deltas.get(field, 0) + sign * amount
+    for board_id, changes in deltas.items():
+        changes = {field: F(field) + amount for field, amount in changes.items() if amount}
+        if board_id and changes:
+            BoardStats.objects.filter(board_id=board_id).update(**changes)
+
+
+def count_created_tasks(tasks, sign=1):
+    """
+    Add the counters of newly created tasks (e.g. from bulk_create).
+    - sign=-1 subtracts tasks removed without signals (archiving)
+    - One F-expression UPDATE per distinct change, boards with the same
+      change share it
+    """
+    deltas = {}
+    for task in tasks:
+        board_deltas = deltas.setdefault(task.board_id, {})
+        for field, amount in task_counters(task.board_id, task.status, task.priority).items():
+            board_deltas[field] = board_deltas.get(field, 0) + sign * amount
+    groups = {}
+    for board_id, changes in deltas.items():
+        changes = tuple((field, amount) for field, amount in sorted(changes.items()) if amount)
+        if board_id and changes:
+            groups.setdefault(changes, []).append(board_id)
+    for changes, board_ids in groups.items():
+        BoardStats.objects.filter(board_id__in=board_ids).update(**{field: F(field) + amount for field, amount in changes})
+
+
+def refresh_member_count(board_ids):
+    """
+    Recount the members of the given boards in a single UPDATE.
+    """
+    if not board_ids:
+        return
+    count = (
+        Boards.members.through.objects.filter(boards=OuterRef("board_id"))
+        .values("boards")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    BoardStats.objects.filter(board_id__in=board_ids).update(member_count=Coalesce(Subquery(count), 0))
+
+
+def rebuild_board_stats(board_ids=None, batch_size=500):
+    """
+    Recompute the stats rows from scratch.
+    - board_ids: limit to these boards, all boards if None
+    - Works in batches: one aggregate query plus bulk writes per batch
+    - Returns the number of rows written
+    """
+    boards = Boards.objects.order_by("pk")
+    if board_ids is not None:
+        boards = boards.filter(pk__in=board_ids)
+    written = 0
+    batch = []
+    for board_id in boards.values_list("pk", flat=True).iterator(chunk_size=batch_size):
+        batch.append(board_id)
+        if len(batch) >= batch_size:
+            written += _rebuild_batch(batch)
+            batch = []
+    if batch:
+        written += _rebuild_batch(batch)
+    return written
+
+
+def _rebuild_batch(board_ids):
+    rows = [
+        BoardStats(board_id=board["pk"], **{field: board[field] for field in METRIC_FIELDS})
+        for board in with_metrics(Boards.objects.filter(pk__in=board_ids)).values("pk", *METRIC_FIELDS)
+    ]
+    BoardStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["board"],
+        update_fields=list(METRIC_FIELDS),
+    )
+    return len(rows)
+
+
+def verify_board_stats(batch_size=500):
+    """
+    Compare the stored stats with freshly computed ones.
+    - Yields (board_id, stored, expected) for every mismatch or missing row
+    """
+    boards = with_metrics(Boards.objects.order_by("pk")).values("pk", *METRIC_FIELDS)
+    stored = {}
+    for board in boards.iterator(chunk_size=batch_size):
+        if board["pk"] not in stored:
+            stored = {
+                row["board_id"]: row
+                for row in BoardStats.objects.filter(board_id__gte=board["pk"])
+                .order_by("board_id")
+                .values("board_id", *METRIC_FIELDS)[:batch_size]
+            }
+        expected = {field: board[field] for field in METRIC_FIELDS}
+        row = stored.get(board["pk"])
+        actual = {field: row[field] for field in METRIC_FIELDS} if row else None
+        if actual != expected:
+            yield board["pk"], actual, expected
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from kanban_app.models import Tombstone
+
+
+def sync_config():
+    config = {
+        "OVERLAP": 5,
+        "TOMBSTONE_DAYS": 30,
+    }
+    config.update(getattr(settings, "KANBAN_SYNC", {}))
+    return config
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def make_token(moment):
+    """
+    Encode a point in time as a sync token (microseconds since the epoch).
+    """
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_token(token):
+    """
+    Decode a sync token, raises InvalidToken for malformed values.
+    """
+    try:
+        micros = int(token)
+    except (TypeError, ValueError):
+        raise InvalidToken(token)
+    if micros < 0:
+        raise InvalidToken(token)
+    return datetime(1970, 1, 1, tzinfo=dt_timezone.utc) + timedelta(microseconds=micros)
+
+
+def next_token(now=None):
+    """
+    Token for the next sync.
+    - Lies OVERLAP seconds in the past: a transaction that stamped its rows
+      before this request but commits after it is picked up next time;
+      re-sent rows are harmless upserts
+    """
+    now = now or timezone.now()
+    return make_token(now - timedelta(seconds=sync_config()["OVERLAP"]))
+
+
+def token_expired(since):
+    """
+    True if tombstones newer than since may already have been pruned.
+    """
+    return since < timezone.now() - timedelta(days=sync_config()["TOMBSTONE_DAYS"])
+
+
+def record_tombstone(board_id, kind, object_id):
+    if board_id and object_id:
+        Tombstone.objects.create(board_id=board_id, kind=kind, object_id=object_id)
+
+
+def record_tombstones(kind, objects):
+    """
+    Record tombstones for (board_id, object_id) pairs with one INSERT.
+    """
+    Tombstone.objects.bulk_create([
+        Tombstone(board_id=board_id, kind=kind, object_id=object_id)
+        for board_id, object_id in objects if board_id and object_id
+    ])
+
+
+def changed_since(queryset, since):
+    """
+    Restrict a task or comment queryset to the rows changed since the token.
+    """
+    return queryset.filter(updated_at__gte=since) if since else queryset
+
+
+def deleted_ids(board_id, since):
+    """
+    Ids of the tasks and comments that left the board since the token.
+    - Objects that came back afterwards (a task moved away and back) are
+      left to the upserts
+    """
+    deleted = {"tasks": set(), "comments": set()}
+    if since is None:
+        return deleted
+    rows = Tombstone.objects.filter(board_id=board_id, deleted_at__gte=since).values_list("kind", "object_id")
+    for kind, object_id in rows:
+        deleted[f"{kind}s"].add(object_id)
+    return deleted
+
+
+def prune_tombstones(days=None, batch_size=1000):
+    """
+    Delete tombstones older than TOMBSTONE_DAYS in batches, returns the count.
+    """
+    days = sync_config()["TOMBSTONE_DAYS"] if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(Tombstone.objects.filter(deleted_at__lt=cutoff).values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += Tombstone.objects.filter(pk__in=ids).delete()[0]
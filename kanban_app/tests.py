@@ -1,3 +1,372 @@
+import json
+import re
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from kanban_app.api.projections import comment_rows, comments_data, task_rows, tasks_data
+from kanban_app.api.serializer import ChangedCommentSerializer, CommentSerializer, TasksSerializer
+from kanban_app.api.views import task_list_queryset
+from kanban_app.importer import Importer
+from kanban_app.membership import is_board_member, membership_cache
+from kanban_app.models import ArchivedComment, ArchivedTask, Boards, BoardStats, Comment, DashboardTasks
+from kanban_app.sync import make_token
+
+
+def make_board(owner, members=(), tasks=0, title="Board"):
+    board = Boards.objects.create(title=title, owner=owner)
+    board.members.add(*members)
+    for number in range(tasks):
+        DashboardTasks.objects.create(
+            title=f"Task {number}", description="", board=board,
+            status="to-do" if number % 2 else "done", priority="high" if number % 3 else "low",
+        )
+    return board
+
+
+class BoardListQueryCountTests(TestCase):
+    """
+    GET /api/boards/ reads the board metrics from the stats rows, the number
+    of queries does not grow with the number of boards.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", "owner@example.com")
+        cls.members = [User.objects.create_user(f"member{number}", f"member{number}@example.com") for number in range(3)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def list_boards(self):
+        # Versions for the ETag, then the boards joined with their stats
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_one_board(self):
+        make_board(self.user, self.members, tasks=3)
+        self.assertEqual(len(self.list_boards()), 1)
+
+    def test_many_boards_with_tasks_and_members(self):
+        for number in range(10):
+            make_board(self.user, self.members, tasks=6, title=f"Board {number}")
+        other = User.objects.create_user("other", "other@example.com")
+        for number in range(5):
+            make_board(other, [self.user, *self.members[:number]], tasks=number, title=f"Shared {number}")
+        boards = self.list_boards()
+        self.assertEqual(len(boards), 15)
+        first = next(board for board in boards if board["title"] == "Board 0")
+        self.assertEqual(first["member_count"], 3)
+        self.assertEqual(first["ticket_count"], 6)
+        self.assertEqual(first["tasks_to_do_count"], 3)
+        self.assertEqual(first["tasks_high_prio_count"], 4)
+
+
+class HotPathQueryPlanTests(TestCase):
+    """
+    EXPLAIN QUERY PLAN of every query the hot endpoints run: a full scan of
+    a table ("SCAN <table>", also over a whole index) fails the test.
+    - SQLite only, the plan format is database specific
+    """
+    FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(\S+)")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", "Owner@example.com", "secret-password")
+        member = User.objects.create_user("member", "member@example.com")
+        cls.board = make_board(cls.user, [member], tasks=3)
+        cls.task = cls.board.tasks.first()
+        cls.task.assignee_id = cls.user
+        cls.task.reviewer_id = cls.user
+        cls.task.save()
+        Comment.objects.create(task=cls.task, content="Comment", author=member)
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN output is SQLite specific")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def full_scans(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(path, data, format="json")
+        self.assertLess(response.status_code, 400, response.content)
+        scans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if not query["sql"].startswith("SELECT"):
+                    continue
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                scans += [(row[3], query["sql"]) for row in cursor.fetchall() if self.FULL_SCAN.match(row[3])]
+        return scans
+
+    def test_no_full_table_scans(self):
+        requests = [
+            ("get", "/api/boards/"),
+            ("get", f"/api/boards/{self.board.pk}/"),
+            ("get", "/api/tasks/assigned-to-me/"),
+            ("get", "/api/tasks/reviewing/"),
+            ("get", f"/api/tasks/{self.task.pk}/comments/"),
+            ("get", "/api/email-check/?email=OWNER@example.com"),
+        ]
+        for method, path in requests:
+            with self.subTest(path=path):
+                self.assertEqual(self.full_scans(method, path), [])
+
+    def test_login_by_email_uses_the_email_index(self):
+        self.client.force_authenticate(None)
+        scans = self.full_scans("post", "/api/login/", {"email": "owner@EXAMPLE.com", "password": "secret-password"})
+        self.assertEqual(scans, [])
+
+
+class ProjectionContractTests(TestCase):
+    """
+    The row mappers of kanban_app.api.projections render the same JSON as
+    the serializers they replace, for live and archived rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user("owner", "owner@example.com", first_name="Olga", last_name="Owner")
+        nameless = User.objects.create_user("nameless", "nameless@example.com")
+        board = make_board(owner, [nameless])
+        cls.full = DashboardTasks.objects.create(
+            title="Full", description="All fields set", board=board, assignee_id=owner, reviewer_id=nameless,
+            due_date=date(2026, 3, 1), priority="high", status="review",
+        )
+        cls.empty = DashboardTasks.objects.create(title="Empty", description="", board=board)
+        Comment.objects.create(task=cls.full, content="First", author=owner)
+        Comment.objects.create(task=cls.full, content="Second", author=nameless)
+        now = timezone.now()
+        cls.archived = ArchivedTask.objects.create(
+            id=10_000, title="Archived", description="Done long ago", board=board, assignee_id=owner,
+            due_date=date(2025, 1, 31), updated_at=now,
+        )
+        ArchivedTask.objects.create(id=10_001, title="Archived empty", description="", board=board, updated_at=now)
+        ArchivedComment.objects.create(
+            id=20_000, task=cls.archived, content="Old", author=owner, created_at=now, updated_at=now,
+        )
+
+    def assertSameJSON(self, mapped, serialized):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(mapped), renderer.render(serialized))
+
+    def test_tasks(self):
+        tasks = task_list_queryset().order_by("pk")
+        self.assertSameJSON(tasks_data(task_rows().order_by("pk")), TasksSerializer(tasks, many=True).data)
+
+    def test_tasks_with_archived_flag(self):
+        live = task_list_queryset().order_by("pk")
+        archived = ArchivedTask.objects.order_by("pk")
+        serialized = [{**data, "archived": False} for data in TasksSerializer(live, many=True).data]
+        serialized += [{**data, "archived": True} for data in TasksSerializer(archived, many=True).data]
+        mapped = tasks_data(task_rows(DashboardTasks.objects.order_by("pk"), archived=True))
+        mapped += tasks_data(task_rows(archived, archived=True))
+        self.assertSameJSON(mapped, serialized)
+
+    def test_comments(self):
+        comments = Comment.objects.select_related("author").order_by("created_at", "pk")
+        rows = comment_rows().order_by("created_at", "pk")
+        self.assertSameJSON(comments_data(rows), CommentSerializer(comments, many=True).data)
+        self.assertSameJSON(comments_data(rows, with_task=True), ChangedCommentSerializer(comments, many=True).data)
+
+    def test_archived_comments(self):
+        comments = ArchivedComment.objects.select_related("author").order_by("created_at", "pk")
+        rows = comment_rows(ArchivedComment.objects.order_by("created_at", "pk"))
+        self.assertSameJSON(comments_data(rows), CommentSerializer(comments, many=True).data)
+
+
+class MembershipCacheTests(TestCase):
+    """
+    Membership changes evict the cached checks again after the commit, so a
+    check that ran before the commit cannot keep the old answer.
+    """
+
+    def setUp(self):
+        membership_cache.clear()
+        self.owner = User.objects.create_user("owner", "owner@example.com")
+        self.member = User.objects.create_user("member", "member@example.com")
+        self.board = make_board(self.owner, [self.member])
+
+    def test_removed_member_loses_access_after_commit(self):
+        self.assertTrue(is_board_member(self.member, self.board.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.board.members.remove(self.member)
+                # A concurrent request still sees the committed membership
+                membership_cache.set((self.board.pk, self.member.pk), True)
+        self.assertIsNone(membership_cache.get((self.board.pk, self.member.pk)))
+        self.assertFalse(is_board_member(self.member, self.board.pk))
+
+
+class DeltaSyncMoveTests(TestCase):
+    """
+    A task moved to another board reaches the delta sync of the new board
+    together with its comments, and leaves the old one.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", "owner@example.com")
+        self.source = make_board(self.owner, title="Source")
+        self.target = make_board(self.owner, title="Target")
+        self.task = DashboardTasks.objects.create(title="Moved", description="", board=self.source)
+        self.comments = [Comment.objects.create(task=self.task, content=f"Comment {number}", author=self.owner)
+                         for number in range(2)]
+        hour_ago = timezone.now() - timedelta(hours=1)
+        DashboardTasks.objects.filter(pk=self.task.pk).update(updated_at=hour_ago)
+        Comment.objects.filter(task=self.task).update(updated_at=hour_ago)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def changes(self, board, since):
+        response = self.client.get(f"/api/boards/{board.pk}/changes/", {"since": make_token(since)})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_moved_task_brings_its_comments(self):
+        since = timezone.now() - timedelta(minutes=1)
+        task = DashboardTasks.objects.get(pk=self.task.pk)
+        task.board = self.target
+        task.save()
+        target = self.changes(self.target, since)
+        self.assertEqual([row["id"] for row in target["tasks"]], [self.task.pk])
+        self.assertEqual([row["id"] for row in target["comments"]], [comment.pk for comment in self.comments])
+        source = self.changes(self.source, since)
+        self.assertEqual(source["tasks"], [])
+        self.assertEqual(source["deleted"]["tasks"], [self.task.pk])
+
+
+class DeletedBoardListTests(TestCase):
+    """
+    Tasks of a deleted board that still waits for its purge job are left out
+    of the assigned and reviewing lists.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", "owner@example.com")
+        self.member = User.objects.create_user("member", "member@example.com")
+        deleted = make_board(self.owner, [self.member], tasks=2, title="Deleted")
+        kept = make_board(self.owner, [self.member], tasks=2, title="Kept")
+        DashboardTasks.objects.update(assignee_id=self.member, reviewer_id=self.member)
+        self.kept = sorted(kept.tasks.values_list("pk", flat=True))
+        Boards.objects.filter(pk=deleted.pk).update(deleted_at=timezone.now())
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def test_lists_skip_deleted_boards(self):
+        for path in ("/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(sorted(task["id"] for task in response.json()["results"]), self.kept)
+
+
+class ImporterTests(TestCase):
+    """
+    NDJSON import: records after a rejected board record are not imported
+    into the board before it.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner", "owner@example.com")
+
+    def run_import(self, records, batch_size=None):
+        return Importer(self.user, batch_size=batch_size).run(json.dumps(record) for record in records)
+
+    def test_rejected_board_in_the_middle(self):
+        records = [
+            {"record": "board", "title": "Good"},
+            {"record": "task", "id": "a", "title": "a"},
+            {"record": "board", "title": ""},
+            {"record": "task", "id": "b", "title": "belongs to bad board"},
+            {"record": "comment", "task": "b", "content": "Lost", "author": "owner@example.com"},
+            {"record": "board", "title": "Next"},
+            {"record": "task", "title": "c"},
+        ]
+        for batch_size in (1, 100):
+            with self.subTest(batch_size=batch_size):
+                DashboardTasks.objects.all().delete()
+                Boards.objects.all().delete()
+                report = self.run_import(records, batch_size)
+                tasks = DashboardTasks.objects.order_by("pk").values_list("title", "board__title")
+                self.assertEqual(list(tasks), [("a", "Good"), ("c", "Next")])
+                self.assertEqual([error["line"] for error in report.errors], [3, 4, 5])
+                self.assertEqual(report.created["boards"], 2)
+
+
+class TaskBulkViewTests(TestCase):
+    """
+    POST and PATCH /api/tasks/bulk/: statistics, versions and the error paths.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner", "owner@example.com")
+        self.other = User.objects.create_user("other", "other@example.com")
+        self.boards = [make_board(self.user, tasks=2, title=f"Board {number}") for number in range(2)]
+        self.foreign = make_board(self.other, tasks=1, title="Foreign")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def item(self, board_id, **fields):
+        return {
+            "board": board_id, "title": "Bulk", "description": "Created in bulk", "status": "to-do", "priority": "high",
+            "assignee_id": self.user.pk, "reviewer_id": self.user.pk, "due_date": None, **fields,
+        }
+
+    def stats(self, board):
+        stats = BoardStats.objects.get(board=board)
+        return stats.ticket_count, stats.tasks_to_do_count, stats.tasks_high_prio_count
+
+    def version(self, board):
+        return Boards.objects.get(pk=board.pk).version
+
+    def test_create(self):
+        first, second = self.boards
+        before = {board.pk: (self.stats(board), self.version(board)) for board in self.boards}
+        foreign_version = self.version(self.foreign)
+        items = [self.item(first.pk), self.item(first.pk, status="done", priority="low"), self.item(second.pk)]
+        response = self.client.post("/api/tasks/bulk/", items, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual([task["board"] for task in response.json()], [first.pk, first.pk, second.pk])
+        (tickets, to_do, high), version = before[first.pk]
+        self.assertEqual(self.stats(first), (tickets + 2, to_do + 1, high + 1))
+        self.assertGreater(self.version(first), version)
+        (tickets, to_do, high), version = before[second.pk]
+        self.assertEqual(self.stats(second), (tickets + 1, to_do + 1, high + 1))
+        self.assertGreater(self.version(second), version)
+        self.assertEqual(self.version(self.foreign), foreign_version)
+
+    def test_move(self):
+        board = self.boards[0]
+        tasks = list(board.tasks.order_by("pk"))
+        version = self.version(board)
+        items = [{"id": task.pk, "status": "to-do", "priority": "high"} for task in tasks]
+        response = self.client.patch("/api/tasks/bulk/", items, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.stats(board), (2, 2, 2))
+        self.assertGreater(self.version(board), version)
+        self.assertEqual(set(DashboardTasks.objects.filter(board=board).values_list("status", flat=True)), {"to-do"})
+
+    def test_unknown_board_or_task(self):
+        response = self.client.post("/api/tasks/bulk/", [self.item(999_999)], format="json")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.patch("/api/tasks/bulk/", [{"id": 999_999, "status": "done"}], format="json")
+        self.assertEqual(response.status_code, 404)
 
-# Create your tests here.
\ No newline at end of file
+    def test_foreign_board(self):
+        stats = self.stats(self.foreign)
+        items = [self.item(self.boards[0].pk), self.item(self.foreign.pk)]
+        self.assertEqual(self.client.post("/api/tasks/bulk/", items, format="json").status_code, 403)
+        task = self.foreign.tasks.get()
+        response = self.client.patch("/api/tasks/bulk/", [{"id": task.pk, "status": "done"}], format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.stats(self.foreign), stats)
+        self.assertEqual(DashboardTasks.objects.filter(board__in=self.boards).count(), 4)
@@ -0,0 +1,120 @@
+"""
+Email lookups of the board member picker.
+
+Emails are compared case-insensitively on LOWER(email), which is indexed
+(auth_app migration 0002): exact lookups are one IN query, prefixes are a
+range scan on the same index. Typeahead results are cached for TIMEOUT
+seconds; a cached result with fewer than PREFIX_LIMIT users also answers
+every longer prefix.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models.functions import Lower
+from kanban_app.api.projections import full_name
+
+
+def lookup_config():
+    config = {
+        "MAX_EMAILS": 100,
+        "PREFIX_MIN_LENGTH": 3,
+        "PREFIX_LIMIT": 10,
+        "CACHE_ALIAS": "default",
+        "TIMEOUT": 30,
+    }
+    config.update(getattr(settings, "KANBAN_EMAIL_LOOKUP", {}))
+    return config
+
+
+def user_data(row):
+    # Same shape as CheckMailSerializer
+    return {"id": row["id"], "email": row["email"], "fullname": full_name(row["first_name"], row["last_name"])}
+
+
+def user_rows():
+    return (
+        User.objects.annotate(email_lower=Lower("email"))
+        .values("id", "email", "first_name", "last_name", "email_lower")
+    )
+
+
+def find_users_by_email(emails):
+    """
+    Resolve a list of emails in one query.
+    - Returns {"found": [...], "missing": [...], "invalid": [...]}, in
+      request order and without duplicates
+    - Case-insensitive; if several users share an address, the oldest wins
+    """
+    found, missing, invalid = [], [], []
+    wanted = {}
+    for email in emails:
+        email = email.strip() if isinstance(email, str) else ""
+        try:
+            validate_email(email)
+        except ValidationError:
+            invalid.append(email)
+            continue
+        wanted.setdefault(email.lower(), email)
+    users = {}
+    if wanted:
+        for row in user_rows().filter(email_lower__in=list(wanted)).order_by("-pk"):
+            users[row["email_lower"]] = row
+    for email_lower, email in wanted.items():
+        row = users.get(email_lower)
+        if row is None:
+            missing.append(email)
+        else:
+            found.append(user_data(row))
+    return {"found": found, "missing": missing, "invalid": invalid}
+
+
+def prefix_key(prefix):
+    return "email-prefix:" + hashlib.sha256(prefix.encode()).hexdigest()
+
+
+def next_prefix(prefix):
+    """
+    Smallest string greater than every string starting with prefix.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def users_with_prefix(prefix):
+    """
+    Users whose email starts with prefix (case-insensitive), ordered by email.
+    - At most PREFIX_LIMIT users; prefixes shorter than PREFIX_MIN_LENGTH
+      return nothing
+    - New or changed emails show up after TIMEOUT seconds at the latest
+    """
+    config = lookup_config()
+    prefix = prefix.strip().lower()
+    if len(prefix) < config["PREFIX_MIN_LENGTH"]:
+        return []
+    limit = config["PREFIX_LIMIT"]
+    cache = caches[config["CACHE_ALIAS"]] if config["TIMEOUT"] > 0 else None
+    if cache is not None:
+        # The typed prefix and every shorter one, in one cache round trip
+        keys = {prefix_key(prefix[:length]): length for length in range(config["PREFIX_MIN_LENGTH"], len(prefix) + 1)}
+        cached = cache.get_many(list(keys))
+        for key, length in sorted(keys.items(), key=lambda item: -item[1]):
+            users = cached.get(key)
+            if users is None:
+                continue
+            if length == len(prefix):
+                return users
+            if len(users) < limit:
+                # Complete list for the shorter prefix
+                return [user for user in users if user["email"].lower().startswith(prefix)]
+    rows = (
+        user_rows()
+        .filter(email_lower__gte=prefix, email_lower__lt=next_prefix(prefix))
+        .order_by("email_lower", "pk")[:limit]
+    )
+    users = [user_data(row) for row in rows]
+    if cache is not None:
+        cache.set(prefix_key(prefix), users, config["TIMEOUT"])
+    return users
@@ -0,0 +1,12 @@
+from django.db.models import F
+from kanban_app.models import Boards
+
+
+def bump_board_versions(board_ids):
+    """
+    Increase the version of the given boards in one UPDATE.
+    """
+    board_ids = {board_id for board_id in board_ids if board_id}
+    if board_ids:
+        Boards.objects.filter(pk__in=board_ids).update(version=F("version") + 1)
+